@@ -4,14 +4,22 @@ Performs compliance case checking using Bedrock Claude
 """
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from typing import List, Optional, Tuple, Literal
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import TypeAdapter
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
+from botocore.exceptions import ClientError
 
 from utils import helper
 from utils.error_handler import lambda_error_handler
-from utils.prompt_management import invoke_with_prompt_management, get_prompt_arn_from_parameter_store
+from utils.prompt_management import (
+    invoke_with_prompt_management, get_prompt_arn_from_parameter_store, get_ssm_cached, prefetch_ssm_parameters,
+    SSM_CACHE_TTL_SECONDS
+)
 from utils.aws_clients import AWSClients
 from constants import *
 
@@ -23,44 +31,72 @@ except ImportError:
     KB_ENABLED = False
     helper.log_json("WARNING", "KB_MODULE_NOT_FOUND", message="Running without Knowledge Base integration")
 
+# Optional Aho-Corasick automaton for evidence quote lookup (falls back to str.find)
+try:
+    import ahocorasick
+    AHOCORASICK_ENABLED = bool(ahocorasick.unicode)
+except ImportError:
+    AHOCORASICK_ENABLED = False
+
 # Use centralized AWS clients
 bedrock = AWSClients.bedrock_runtime()
 s3 = AWSClients.s3()
 ssm = AWSClients.ssm()
 
-# DynamoDB client for assessment-results table
-import boto3
-dynamodb = boto3.resource('dynamodb')
+# Overlaps the transcript/VTT reads, and the S3 and DynamoDB saves, within one invocation
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# DynamoDB table for assessment-results
 ASSESSMENT_RESULTS_TABLE = os.environ.get('ASSESSMENT_RESULTS_TABLE', 'assessment-results')
-assessment_table = dynamodb.Table(ASSESSMENT_RESULTS_TABLE)
+assessment_table = AWSClients.dynamodb_resource().Table(ASSESSMENT_RESULTS_TABLE)
 
 # Prompt Management configuration
 USE_PROMPT_MANAGEMENT = os.environ.get("USE_PROMPT_MANAGEMENT", "true").lower() == "true"
 PROMPT_PARAM_NAME = os.environ.get("PROMPT_PARAM_NAME_CASE_CHECK", "/call-summariser/prompts/case-check/current")
 
-# Cache for prompt ARN (loaded once per Lambda container)
+# Cache for prompt ARN (refreshed from Parameter Store after a TTL)
 _prompt_arn_cache = {}
 
 # Get KB configuration from environment
 USE_KB = os.environ.get("USE_KNOWLEDGE_BASE", "true").lower() == "true"
 KB_PARAM_NAME = os.environ.get("KNOWLEDGE_BASE_PARAM_NAME", "/call-summariser/knowledge-base-id")
 
-# Fetch KB ID from Parameter Store (cached for Lambda container lifetime)
-KB_ID = None
-if USE_KB:
+# After a failed KB ID lookup, skip Parameter Store (and the warning) until this epoch time
+_kb_id_retry_at = 0.0
+
+# Load both parameters in one Parameter Store round-trip at cold start
+prefetch_ssm_parameters([
+    KB_PARAM_NAME if USE_KB else None,
+    PROMPT_PARAM_NAME if USE_PROMPT_MANAGEMENT else None,
+])
+
+
+def get_kb_id() -> Optional[str]:
+    """Get KB ID from Parameter Store (cached with a TTL so updates reach warm containers)"""
+    global _kb_id_retry_at
+    if not USE_KB or time.time() < _kb_id_retry_at:
+        return None
+
     try:
-        response = ssm.get_parameter(Name=KB_PARAM_NAME, WithDecryption=False)
-        KB_ID = response['Parameter']['Value']
-        helper.log_json("INFO", "KB_ID_LOADED_FROM_PARAMETER_STORE", kb_param_name=KB_PARAM_NAME)
+        return get_ssm_cached(KB_PARAM_NAME)
     except Exception as e:
+        # Cache the failure for the same TTL as a success, so a missing parameter
+        # costs one SSM call and one warning per TTL rather than per invocation
+        _kb_id_retry_at = time.time() + SSM_CACHE_TTL_SECONDS
         helper.log_json("WARNING", "KB_ID_PARAMETER_NOT_FOUND",
                        kb_param_name=KB_PARAM_NAME,
                        error=str(e),
+                       retry_after_seconds=SSM_CACHE_TTL_SECONDS,
                        message="Knowledge Base integration will be disabled")
+        return None
+
+
+# Speaker types tracked while counting turns in the normalized transcript
+_SPEAKER_NONE, _SPEAKER_COACH, _SPEAKER_CLIENT = 0, 1, 2
 
 
 def get_prompt_arn() -> Optional[str]:
-    """Get prompt ARN from Parameter Store (cached for Lambda container lifetime)"""
+    """Get prompt ARN from Parameter Store (cached with a TTL per Lambda container)"""
     return get_prompt_arn_from_parameter_store(
         param_name=PROMPT_PARAM_NAME,
         cache_dict=_prompt_arn_cache,
@@ -74,53 +110,122 @@ def get_transcript_from_s3(s3_key: str) -> str:
     return response['Body'].read().decode('utf-8')
 
 
+def _vtt_key_for(transcript_key: str) -> str:
+    """
+    Derive VTT key from transcript key.
+    e.g., .../meeting_id=X/redacted_transcript.txt -> .../meeting_id=X/zoom_raw.vtt
+    """
+    return transcript_key.rsplit('/', 1)[0] + '/zoom_raw.vtt'
+
+
 def get_vtt_from_s3(transcript_key: str) -> Optional[str]:
     """
     Try to fetch the VTT file from S3 based on transcript key.
     VTT files are stored alongside transcripts as zoom_raw.vtt
     """
     try:
-        # Derive VTT key from transcript key
-        # e.g., .../meeting_id=X/redacted_transcript.txt -> .../meeting_id=X/zoom_raw.vtt
-        vtt_key = transcript_key.rsplit('/', 1)[0] + '/zoom_raw.vtt'
-        response = s3.get_object(Bucket=SUMMARY_BUCKET, Key=vtt_key)
+        response = s3.get_object(Bucket=SUMMARY_BUCKET, Key=_vtt_key_for(transcript_key))
         return response['Body'].read().decode('utf-8')
     except Exception:
         return None
 
 
+def get_vtt_tail(transcript_key: str, n: int = 4096) -> Optional[str]:
+    """
+    Fetch only the last n bytes of the VTT file using a ranged GET.
+    The final cue timestamp (total duration) lives at the end of the file, so
+    the tail is enough for get_vtt_duration without downloading the whole VTT.
+    Falls back to the full file if the tail contains no cue at all.
+    """
+    try:
+        response = s3.get_object(
+            Bucket=SUMMARY_BUCKET,
+            Key=_vtt_key_for(transcript_key),
+            Range=f"bytes=-{n}"
+        )
+        raw = response['Body'].read()
+    except Exception:
+        return None
+
+    # Timestamps are ASCII, so a multi-byte character split at the range boundary is harmless
+    tail = raw.decode('utf-8', errors='ignore')
+    if '-->' in tail or len(raw) < n:
+        # Found a cue, or the tail already is the whole (short) file
+        return tail
+
+    return get_vtt_from_s3(transcript_key)
+
+
+def _parse_vtt_timestamp(text: str) -> Optional[float]:
+    """Parse a leading HH:MM:SS.mmm (or MM:SS.mmm) timestamp to seconds, None if malformed."""
+    end = 0
+    while end < len(text) and text[end] in '0123456789:.,':
+        end += 1
+
+    parts = text[:end].replace(',', '.').split(':')
+    try:
+        if len(parts) == 3:
+            h, m, s = parts
+            return int(h) * 3600 + int(m) * 60 + float(s)
+        elif len(parts) == 2:
+            m, s = parts
+            return int(m) * 60 + float(s)
+    except ValueError:
+        pass
+
+    return None
+
+
 def get_vtt_duration(vtt_content: str) -> float:
     """
     Extract total call duration from VTT file by finding the last timestamp.
     Returns duration in seconds.
-    """
-    import re
 
+    Scans backwards for the last "start --> end" cue arrow, so only the tail
+    of the file is examined regardless of call length.
+    """
     if not vtt_content:
         return 0.0
 
-    # Normalize line endings
-    vtt_content = vtt_content.replace('\r\n', '\n').replace('\r', '\n')
+    search_end = len(vtt_content)
+    while True:
+        idx = vtt_content.rfind('-->', 0, search_end)
+        if idx < 0:
+            return 0.0
 
-    # Find all end timestamps (the second timestamp in each "start --> end" line)
-    # Pattern matches HH:MM:SS.mmm or MM:SS.mmm
-    timestamps = re.findall(r'-->\s*(\d{1,2}:\d{2}:\d{2}[.,]\d+)', vtt_content)
+        # Timestamps are at most ~16 chars; 32 leaves room for padding/newlines
+        duration = _parse_vtt_timestamp(vtt_content[idx + 3:idx + 35].lstrip())
+        if duration is not None:
+            return duration
 
-    if not timestamps:
-        return 0.0
+        # Malformed cue - keep searching earlier in the file
+        search_end = idx
 
-    # Parse the last timestamp to get total duration
-    last_ts = timestamps[-1].replace(',', '.')
-    parts = last_ts.split(':')
 
-    if len(parts) == 3:
-        h, m, s = parts
-        return int(h) * 3600 + int(m) * 60 + float(s)
-    elif len(parts) == 2:
-        m, s = parts
-        return int(m) * 60 + float(s)
+def _count_speaker_words(transcript: str) -> Tuple[int, int, int, int]:
+    """Count (coach_words, client_words, coach_turns, client_turns) from COACH:/CLIENT: labelled lines"""
+    coach_words = 0
+    client_words = 0
+    coach_turns = 0
+    client_turns = 0
+    last_speaker_type = _SPEAKER_NONE
 
-    return 0.0
+    # Parse the normalized transcript (expects COACH: and CLIENT: labels)
+    for line in transcript.split('\n'):
+        line = line.lstrip()
+
+        # Fixed speaker prefixes - cheaper than a regex match per line
+        if line.startswith('COACH:'):
+            coach_words += len(line[6:].split())
+            if last_speaker_type != _SPEAKER_COACH:
+                coach_turns += 1
+                last_speaker_type = _SPEAKER_COACH
+        elif line.startswith('CLIENT:'):
+            client_words += len(line[7:].split())
+            if last_speaker_type != _SPEAKER_CLIENT:
+                client_turns += 1
+                last_speaker_type = _SPEAKER_CLIENT
+    return coach_words, client_words, coach_turns, client_turns
 
 
 def calculate_call_analytics(transcript: str, vtt_content: Optional[str] = None) -> dict:
@@ -136,39 +241,8 @@ def calculate_call_analytics(transcript: str, vtt_content: Optional[str] = None)
         - Talk ratios (by word count)
         - Words per minute (if VTT duration available)
     """
-    import re
-
-    # Initialize tracking
-    coach_words = 0
-    client_words = 0
-    coach_turns = 0
-    client_turns = 0
-    last_speaker_type = None
-
-    # Parse the normalized transcript (expects COACH: and CLIENT: labels)
-    lines = transcript.split('\n')
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        # Match COACH: or CLIENT: at start of line
-        speaker_match = re.match(r'^(COACH|CLIENT):\s*(.*)$', line)
-        if speaker_match:
-            speaker = speaker_match.group(1)
-            text = speaker_match.group(2).strip()
-            word_count = len(text.split()) if text else 0
-
-            if speaker == 'COACH':
-                coach_words += word_count
-                if last_speaker_type != 'COACH':
-                    coach_turns += 1
-                    last_speaker_type = 'COACH'
-            else:  # CLIENT
-                client_words += word_count
-                if last_speaker_type != 'CLIENT':
-                    client_turns += 1
-                    last_speaker_type = 'CLIENT'
+    # Count words and turns per speaker
+    coach_words, client_words, coach_turns, client_turns = _count_speaker_words(transcript)
 
     # Calculate derived metrics
     total_words = coach_words + client_words
@@ -229,16 +303,18 @@ Span = Tuple[int, int]
 Status = Literal["Competent", "CompetentWithDevelopment", "Fail", "NotApplicable", "Inconclusive"]
 
 
-class CaseCheckResult(BaseModel):
+@dataclass(slots=True)
+class CaseCheckResult:
     id: str
     status: Status
     confidence: float
-    evidence_spans: List[Span] = Field(default_factory=list)
+    evidence_spans: List[Span] = field(default_factory=list)
     evidence_quote: Optional[str] = ""
     comment: Optional[str] = ""
 
 
-class CaseCheckPayload(BaseModel):
+@dataclass(slots=True)
+class CaseCheckPayload:
     check_schema_version: str
     session_type: str
     checklist_version: str
@@ -249,80 +325,88 @@ class CaseCheckPayload(BaseModel):
     overall: dict
 
 
+# Validates the tool output against the dataclasses without BaseModel instances
+_CASE_CHECK_PAYLOAD_ADAPTER = TypeAdapter(CaseCheckPayload)
+
+
 # ---------- Tool definition for structured output ----------
-def get_case_check_tool():
-    """
-    Create a tool definition for structured case check output.
-    This ensures the LLM returns valid JSON matching our Pydantic schema.
-    """
-    return {
-        "toolSpec": {
-            "name": "submit_case_check",
-            "description": "Submit the case check assessment results. Focus on providing the 'results' array with your assessment of each check, and the 'overall' summary. Metadata fields are optional and will be populated automatically.",
-            "inputSchema": {
-                "json": {
-                    "type": "object",
-                    "properties": {
-                        "check_schema_version": {"type": "string"},
-                        "session_type": {"type": "string"},
-                        "checklist_version": {"type": "string"},
-                        "meeting_id": {"type": "string"},
-                        "model_version": {"type": "string"},
-                        "prompt_version": {"type": "string"},
-                        "results": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "id": {"type": "string", "description": "Check identifier"},
-                                    "status": {
-                                        "type": "string",
-                                        "enum": ["Competent", "CompetentWithDevelopment", "Fail", "NotApplicable", "Inconclusive"],
-                                        "description": "Assessment status"
-                                    },
-                                    "confidence": {
-                                        "type": "number",
-                                        "minimum": 0.0,
-                                        "maximum": 1.0,
-                                        "description": "Confidence score 0-1"
-                                    },
-                                    "evidence_spans": {
+# Static schema - built once per Lambda container rather than on every invocation
+_CASE_CHECK_TOOL = {
+    "toolSpec": {
+        "name": "submit_case_check",
+        "description": "Submit the case check assessment results. Focus on providing the 'results' array with your assessment of each check, and the 'overall' summary. Metadata fields are optional and will be populated automatically.",
+        "inputSchema": {
+            "json": {
+                "type": "object",
+                "properties": {
+                    "check_schema_version": {"type": "string"},
+                    "session_type": {"type": "string"},
+                    "checklist_version": {"type": "string"},
+                    "meeting_id": {"type": "string"},
+                    "model_version": {"type": "string"},
+                    "prompt_version": {"type": "string"},
+                    "results": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "string", "description": "Check identifier"},
+                                "status": {
+                                    "type": "string",
+                                    "enum": ["Competent", "CompetentWithDevelopment", "Fail", "NotApplicable", "Inconclusive"],
+                                    "description": "Assessment status"
+                                },
+                                "confidence": {
+                                    "type": "number",
+                                    "minimum": 0.0,
+                                    "maximum": 1.0,
+                                    "description": "Confidence score 0-1"
+                                },
+                                "evidence_spans": {
+                                    "type": "array",
+                                    "items": {
                                         "type": "array",
-                                        "items": {
-                                            "type": "array",
-                                            "items": {"type": "integer"},
-                                            "minItems": 2,
-                                            "maxItems": 2
-                                        },
-                                        "description": "List of [start, end] character positions"
+                                        "items": {"type": "integer"},
+                                        "minItems": 2,
+                                        "maxItems": 2
                                     },
-                                    "evidence_quote": {
-                                        "type": "string",
-                                        "description": "REQUIRED: Direct quote from transcript supporting your assessment. Must be actual dialogue from the call."
-                                    },
-                                    "comment": {
-                                        "type": "string",
-                                        "description": "REQUIRED: Brief explanation of your assessment (1-2 sentences)"
-                                    }
+                                    "description": "List of [start, end] character positions"
                                 },
-                                "required": ["id", "status", "confidence", "evidence_quote", "evidence_spans", "comment"]
-                            }
-                        },
-                        "overall": {
-                            "type": "object",
-                            "properties": {
-                                "pass_rate": {"type": "number"},
-                                "failed_ids": {"type": "array", "items": {"type": "string"}},
-                                "high_severity_flags": {"type": "array", "items": {"type": "string"}},
-                                "has_high_severity_failures": {"type": "boolean"}
-                            }
+                                "evidence_quote": {
+                                    "type": "string",
+                                    "description": "REQUIRED: Direct quote from transcript supporting your assessment. Must be actual dialogue from the call."
+                                },
+                                "comment": {
+                                    "type": "string",
+                                    "description": "REQUIRED: Brief explanation of your assessment (1-2 sentences)"
+                                }
+                            },
+                            "required": ["id", "status", "confidence", "evidence_quote", "evidence_spans", "comment"]
                         }
                     },
-                    "required": ["results", "overall"]
-                }
+                    "overall": {
+                        "type": "object",
+                        "properties": {
+                            "pass_rate": {"type": "number"},
+                            "failed_ids": {"type": "array", "items": {"type": "string"}},
+                            "high_severity_flags": {"type": "array", "items": {"type": "string"}},
+                            "has_high_severity_failures": {"type": "boolean"}
+                        }
+                    }
+                },
+                "required": ["results", "overall"]
             }
         }
     }
+}
+
+
+def get_case_check_tool():
+    """
+    Create a tool definition for structured case check output.
+    This ensures the LLM returns valid JSON matching our Pydantic schema.
+    """
+    return _CASE_CHECK_TOOL
 
 
 STARTER_SESSION_CHECKS = [
@@ -358,10 +442,59 @@ STARTER_SESSION_CHECKS = [
     {"id": "client_questions_opportunity", "prompt": "Did the client have the opportunity to ask any questions? Did the coach provide opportunities throughout and at the end for the client to ask questions?", "required": True, "severity": "medium", "theme": "customerExperience"},
 ]
 
+# Lookups derived from the static checklist (built once per Lambda container)
+_THEME_BY_ID = {c["id"]: c.get("theme", "businessRisk") for c in STARTER_SESSION_CHECKS}
+# Human-readable label: the first question of the check prompt
+_CHECK_LABEL_BY_ID = {c["id"]: c["prompt"].split("?", 1)[0] + "?" for c in STARTER_SESSION_CHECKS}
+_SEVERITY_BY_ID = {c["id"]: c.get("severity", "low") for c in STARTER_SESSION_CHECKS}
+_CHECK_IDS = [c["id"] for c in STARTER_SESSION_CHECKS]
+_CHECK_DESCRIPTIONS = {c["id"]: c["prompt"] for c in STARTER_SESSION_CHECKS}
+# Prompt variable for the checklist, serialised once rather than per invocation
+_CHECKLIST_JSON = json.dumps(
+    {"session_type": "starter_session", "version": "1", "checks": STARTER_SESSION_CHECKS},
+    ensure_ascii=False,
+)
+
 
 # JSON repair and extraction functions removed - no longer needed with structured output via Tool Use
 
 
+def _safe_int_pair(span) -> Optional[List[int]]:
+    """Return [start, end] as ints for a 2-element span, or None if it isn't one."""
+    if isinstance(span, (list, tuple)) and len(span) == 2:
+        try:
+            return [int(span[0]), int(span[1])]
+        except (ValueError, TypeError):
+            return None
+    return None
+
+
+def _find_first_positions(text: str, needles: set) -> dict:
+    """
+    Map each needle to the index of its first occurrence in text (same result as text.find).
+    Needles that don't occur are omitted. Several needles share one Aho-Corasick scan when available.
+    """
+    if not needles:
+        return {}
+    if not AHOCORASICK_ENABLED or len(needles) == 1:
+        positions = {needle: text.find(needle) for needle in needles}
+        return {needle: pos for needle, pos in positions.items() if pos != -1}
+
+    automaton = ahocorasick.Automaton()
+    for needle in needles:
+        automaton.add_word(needle, needle)
+    automaton.make_automaton()
+
+    # Matches arrive in order of end index, so the first hit per needle is its leftmost occurrence
+    positions = {}
+    for end, needle in automaton.iter(text):
+        if needle not in positions:
+            positions[needle] = end - len(needle) + 1
+            if len(positions) == len(needles):
+                break
+    return positions
+
+
 def _save_case_json(meeting_id: str, payload: dict, year: int = None, month: int = None) -> str:
     """Save case check JSON to S3"""
     if year is None or month is None:
@@ -369,38 +502,37 @@ def _save_case_json(meeting_id: str, payload: dict, year: int = None, month: int
         year = now.year
         month = now.month
 
-    if ATHENA_PARTITIONED:
-        key = f"{S3_PREFIX}/supplementary/version={SCHEMA_VERSION}/year={year}/month={month:02d}/meeting_id={meeting_id}/case_check.v{CASE_CHECK_SCHEMA_VERSION}.json"
-    else:
-        key = f"{S3_PREFIX}/{year:04d}/{month:02d}/{meeting_id}/case_check.v{CASE_CHECK_SCHEMA_VERSION}.json"
+    key = helper.case_check_key(meeting_id, year, month)
 
     s3.put_object(
         Bucket=SUMMARY_BUCKET,
         Key=key,
-        Body=json.dumps(payload).encode("utf-8"),
+        Body=orjson.dumps(payload),
         ContentType="application/json",
     )
     helper.log_json("INFO", "CASE_CHECK_SAVED", meetingId=meeting_id, s3Key=key)
     return key
 
 
-def _save_checks_to_assessment_table(meeting_id: str, case_data: dict, transcript_key: str, call_analytics: dict = None):
+def _save_checks_to_assessment_table(meeting_id: str, case_data: dict, transcript_key: str, call_analytics: dict = None,
+                                     now: datetime = None):
     """
     Save individual case check results to assessment-results DynamoDB table.
     Each check becomes a separate item for granular coach review.
     Also saves an overall case assessment record for triage and call analytics.
     """
     try:
-        expires_at = int((datetime.now(timezone.utc) + timedelta(days=90)).timestamp())
-        now_iso = datetime.now(timezone.utc).isoformat()
-
-        # Build lookup for check themes
-        theme_by_id = {c["id"]: c.get("theme", "businessRisk") for c in STARTER_SESSION_CHECKS}
+        if now is None:
+            now = datetime.now(timezone.utc)
+        expires_at = int((now + timedelta(days=90)).timestamp())
+        now_iso = now.isoformat()
 
         # Track failed questions by theme
         failed_business_risk = []
         failed_customer_exp = []
         all_failed_ids = []
+        competent_ids = []
+        check_items = []
 
         for check_result in case_data.get('results', []):
             check_id = check_result.get('id')
@@ -410,21 +542,23 @@ def _save_checks_to_assessment_table(meeting_id: str, case_data: dict, transcrip
             # Determine if this is the vulnerability check
             is_vulnerability_check = (check_id == 'vulnerability_identified')
             check_failed = (check_result.get('status') == 'Fail')
-            theme = theme_by_id.get(check_id, 'businessRisk')
+            theme = _THEME_BY_ID.get(check_id, 'businessRisk')
 
             # Track failures by theme
             if check_failed:
                 all_failed_ids.append(check_id)
                 # Get the human-readable label from check definition
-                check_def = next((c for c in STARTER_SESSION_CHECKS if c["id"] == check_id), None)
-                check_label = check_def["prompt"].split("?")[0] + "?" if check_def else check_id
+                check_label = _CHECK_LABEL_BY_ID.get(check_id, check_id)
 
                 if theme == 'businessRisk':
                     failed_business_risk.append(check_label)
                 else:
                     failed_customer_exp.append(check_label)
 
-            assessment_table.put_item(Item={
+            if check_result.get('status') == 'Competent':
+                competent_ids.append(check_id)
+
+            check_items.append({
                 'meeting_id': meeting_id,
                 'assessment_id': f"case-check#{check_id}",
                 'assessment_type': 'case-check',
@@ -432,13 +566,13 @@ def _save_checks_to_assessment_table(meeting_id: str, case_data: dict, transcrip
                 'model_name': case_data.get('model_version', MODEL_VERSION),
 
                 # AI Output
-                'ai_output': json.dumps({
+                'ai_output': orjson.dumps({
                     'status': check_result.get('status'),
                     'evidence_quote': check_result.get('evidence_quote', ''),
                     'evidence_spans': check_result.get('evidence_spans', []),
                     'comment': check_result.get('comment', ''),
                     'confidence': float(check_result.get('confidence', 0.0))
-                }),
+                }).decode('utf-8'),
 
                 # Review status
                 'review_status': 'pending',
@@ -466,12 +600,6 @@ def _save_checks_to_assessment_table(meeting_id: str, case_data: dict, transcrip
                 'expires_at': expires_at
             })
 
-            helper.log_json("INFO", "CASE_CHECK_ASSESSMENT_SAVED",
-                          meetingId=meeting_id,
-                          checkId=check_id,
-                          status=check_result.get('status'),
-                          theme=theme)
-
         # ============================================
         # Save OVERALL case assessment record (like Thirdparty's triage)
         # ============================================
@@ -506,6 +634,10 @@ def _save_checks_to_assessment_table(meeting_id: str, case_data: dict, transcrip
             'customer_exp_failures': failed_customer_exp,
             'customer_exp_failure_count': len(failed_customer_exp),
 
+            # Competent checks
+            'competent_ids': competent_ids,
+            'competent_count': len(competent_ids),
+
             # High severity flags
             'has_high_severity_failures': overall.get('has_high_severity_failures', False),
             'high_severity_flags': overall.get('high_severity_flags', []),
@@ -524,21 +656,25 @@ def _save_checks_to_assessment_table(meeting_id: str, case_data: dict, transcrip
             'expires_at': expires_at
         }
 
-        # Add call analytics (convert floats to Decimal for DynamoDB)
+        # Add call analytics (convert floats to Decimal for DynamoDB; ints and lists pass through)
         if call_analytics:
-            for key, value in call_analytics.items():
-                if isinstance(value, float):
-                    item[key] = Decimal(str(value))
-                elif isinstance(value, list) and key == 'speakers_detected':
-                    item[key] = value  # Keep list as-is
-                else:
-                    item[key] = value
+            item.update({
+                key: Decimal(str(value)) if isinstance(value, float) else value
+                for key, value in call_analytics.items()
+            })
 
-        assessment_table.put_item(Item=item)
+        # Write all records via BatchWriteItem (25 items per request, unprocessed items retried).
+        # overwrite_by_pkeys de-duplicates repeated check IDs within a batch (last write wins).
+        with assessment_table.batch_writer(overwrite_by_pkeys=['meeting_id', 'assessment_id']) as batch:
+            for check_item in check_items:
+                batch.put_item(Item=check_item)
+            batch.put_item(Item=item)
 
+        # One aggregate log line per call rather than one per check (failed IDs are on the overall record)
         helper.log_json("INFO", "CASE_CHECK_OVERALL_SAVED",
                       meetingId=meeting_id,
                       triage_outcome=triage_outcome,
+                      check_items_saved=len(check_items),
                       failed_count=failed_count,
                       business_risk_failures=len(failed_business_risk),
                       customer_exp_failures=len(failed_customer_exp),
@@ -581,18 +717,16 @@ def lambda_handler(event, context):
     if not meeting_id:
         raise ValueError("meetingId is required")
 
-    # Determine expected case check S3 key
+    # Determine expected case check S3 key (single clock read, reused for the saves below)
     now = datetime.now(timezone.utc)
-    if ATHENA_PARTITIONED:
-        case_key = f"{S3_PREFIX}/supplementary/version={SCHEMA_VERSION}/year={now.year}/month={now.month:02d}/meeting_id={meeting_id}/case_check.v{CASE_CHECK_SCHEMA_VERSION}.json"
-    else:
-        case_key = f"{S3_PREFIX}/{now.year:04d}/{now.month:02d}/{meeting_id}/case_check.v{CASE_CHECK_SCHEMA_VERSION}.json"
+    case_key = helper.case_check_key(meeting_id, now.year, now.month)
 
     # Idempotency check: If case check already exists and not forcing reprocess, return it
     if not force_reprocess:
         try:
+            # A single GET: a missing key (NoSuchKey) is the normal miss path
             response = s3.get_object(Bucket=SUMMARY_BUCKET, Key=case_key)
-            case_data = json.loads(response['Body'].read().decode('utf-8'))
+            case_data = orjson.loads(response['Body'].read())
             pass_rate = float(case_data.get("overall", {}).get("pass_rate", 0.0))
             helper.log_json("INFO", "CASE_CHECK_EXISTS", meetingId=meeting_id, caseKey=case_key, reused=True)
             return {
@@ -600,15 +734,19 @@ def lambda_handler(event, context):
                 "caseKey": case_key,
                 "passRate": pass_rate
             }
-        except s3.exceptions.NoSuchKey:
-            # File doesn't exist, proceed with case check
-            pass
+        except ClientError as e:
+            # Anything other than a missing key is unexpected
+            if not helper.is_s3_not_found(e):
+                helper.log_json("WARN", "CASE_CHECK_CHECK_FAILED", meetingId=meeting_id, error=str(e))
         except Exception as e:
             # Log error but continue with processing
             helper.log_json("WARN", "CASE_CHECK_CHECK_FAILED", meetingId=meeting_id, error=str(e))
 
-    # Fetch transcript from S3 (already normalized with COACH/CLIENT labels)
-    full_transcript = get_transcript_from_s3(transcript_key)
+    # Fetch transcript from S3 (already normalized with COACH/CLIENT labels).
+    # The VTT is only needed when metrics weren't passed in; fetch both concurrently.
+    transcript_future = _IO_EXECUTOR.submit(get_transcript_from_s3, transcript_key)
+    vtt_future = None if call_metrics_from_event else _IO_EXECUTOR.submit(get_vtt_tail, transcript_key)
+    full_transcript = transcript_future.result()
 
     # Use pre-extracted metrics if provided, otherwise calculate locally (fallback)
     if call_metrics_from_event:
@@ -622,8 +760,9 @@ def lambda_handler(event, context):
         # Fallback: Calculate locally if metrics not passed (backward compatibility)
         helper.log_json("INFO", "CALCULATING_METRICS_LOCALLY", meetingId=meeting_id,
                        message="callMetrics not provided, calculating locally")
-        vtt_content = get_vtt_from_s3(transcript_key)
-        call_analytics = calculate_call_analytics(full_transcript, vtt_content)
+        # Only the total duration is read from the VTT, so the file tail is sufficient
+        vtt_tail = vtt_future.result()
+        call_analytics = calculate_call_analytics(full_transcript, vtt_tail)
         helper.log_json("INFO", "CALL_ANALYTICS_CALCULATED",
                        meetingId=meeting_id,
                        total_words=call_analytics.get('total_words', 0),
@@ -642,20 +781,17 @@ def lambda_handler(event, context):
 
     # Retrieve KB examples for compliance checks
     kb_examples = ""
-    if USE_KB and KB_ENABLED and KB_ID:
+    kb_id = get_kb_id() if KB_ENABLED else None
+    if USE_KB and KB_ENABLED and kb_id:
         try:
-            import time
             kb_start_time = time.time()
-            helper.log_json("INFO", "KB_RETRIEVAL_START", meetingId=meeting_id, kb_id=KB_ID)
-
-            check_ids = [c["id"] for c in STARTER_SESSION_CHECKS]
-            check_descriptions = {c["id"]: c["prompt"] for c in STARTER_SESSION_CHECKS}
+            helper.log_json("INFO", "KB_RETRIEVAL_START", meetingId=meeting_id, kb_id=kb_id)
 
             kb_examples = retrieve_and_format_examples(
-                check_ids=check_ids,
-                check_descriptions=check_descriptions,
+                check_ids=_CHECK_IDS,
+                check_descriptions=_CHECK_DESCRIPTIONS,
                 max_per_check=1,
-                kb_id=KB_ID
+                kb_id=kb_id
             )
 
             kb_elapsed = time.time() - kb_start_time
@@ -674,21 +810,16 @@ def lambda_handler(event, context):
                        meetingId=meeting_id,
                        use_kb=USE_KB,
                        kb_enabled=KB_ENABLED,
-                       has_kb_id=bool(KB_ID))
+                       has_kb_id=bool(kb_id))
 
     # Process full transcript in single API call
     case_check_tool = get_case_check_tool()
     prompt_arn = get_prompt_arn()
 
     if prompt_arn:
-        checklist_json = json.dumps(
-            {"session_type": "starter_session", "version": "1", "checks": STARTER_SESSION_CHECKS},
-            ensure_ascii=False,
-        )
-
         variables = {
             "kb_examples": kb_examples if kb_examples else "",
-            "checklist_json": checklist_json,
+            "checklist_json": _CHECKLIST_JSON,
             "cleaned_transcript": full_transcript
         }
 
@@ -730,9 +861,8 @@ def lambda_handler(event, context):
     validated_json.setdefault("check_schema_version", CASE_CHECK_SCHEMA_VERSION)
     validated_json.setdefault("session_type", "starter_session")
     validated_json.setdefault("checklist_version", "1")
-    validated_json.setdefault("meeting_id", meeting_id)
-    validated_json.setdefault("model_version", MODEL_VERSION)
-    validated_json.setdefault("prompt_version", PROMPT_VERSION)
+    # These are always ours, whatever the model returned
+    validated_json.update(meeting_id=meeting_id, model_version=MODEL_VERSION, prompt_version=PROMPT_VERSION)
 
     # Defensive parsing for stringified fields (only if needed)
     # Tool Use should return structured JSON, but handle edge cases
@@ -762,87 +892,55 @@ def lambda_handler(event, context):
             raise ValueError(f"Failed to parse case check results for meeting {meeting_id}. "
                            f"Stop reason: {stop_reason}. Error: {str(e)}") from e
 
-    # Calculate 'overall' if model didn't provide it (fallback calculation)
-    if "overall" not in validated_json or not validated_json.get("overall"):
+    # Calculate 'overall' if model didn't provide it (fallback calculation, filled in after
+    # validation from the same pass over the results that normalises them)
+    overall_missing = not validated_json.get("overall")
+    if overall_missing:
         helper.log_json("WARNING", "OVERALL_MISSING_FROM_MODEL",
                        meetingId=meeting_id,
                        message="Model did not return 'overall' field - calculating from results")
-
-        results_list = validated_json.get("results", [])
-        if isinstance(results_list, list):
-            # Calculate pass rate and failed IDs
-            total_checks = len(results_list)
-            failed_ids = []
-            high_severity_flags = []
-            severity_by_id = {c["id"]: c.get("severity", "low") for c in STARTER_SESSION_CHECKS}
-
-            for r in results_list:
-                if isinstance(r, dict) and r.get("status") == "Fail":
-                    check_id = r.get("id", "")
-                    failed_ids.append(check_id)
-                    if severity_by_id.get(check_id) == "high":
-                        high_severity_flags.append(check_id)
-
-            passed_count = total_checks - len(failed_ids)
-            pass_rate = (passed_count / total_checks * 100) if total_checks > 0 else 0.0
-
-            validated_json["overall"] = {
-                "pass_rate": round(pass_rate, 1),
-                "failed_ids": failed_ids,
-                "high_severity_flags": high_severity_flags,
-                "has_high_severity_failures": len(high_severity_flags) > 0
-            }
-
-            helper.log_json("INFO", "OVERALL_CALCULATED",
-                           meetingId=meeting_id,
-                           pass_rate=pass_rate,
-                           failed_count=len(failed_ids),
-                           high_severity_count=len(high_severity_flags))
-        else:
-            # Fallback empty overall if results is malformed
-            validated_json["overall"] = {
-                "pass_rate": 0.0,
-                "failed_ids": [],
-                "high_severity_flags": [],
-                "has_high_severity_failures": False
-            }
+        validated_json["overall"] = {}
 
     # Clean up and calculate evidence_spans
     if "results" in validated_json and isinstance(validated_json["results"], list):
+        # Results whose spans must be located from the quote, resolved together after the loop
+        pending_quotes = []
         for result_item in validated_json["results"]:
             if isinstance(result_item, dict):
                 evidence_quote = result_item.get("evidence_quote", "")
                 evidence_spans = result_item.get("evidence_spans", [])
 
-                # Filter out invalid spans (must be [int, int] with 2 elements)
-                if evidence_spans:
-                    valid_spans = []
-                    for span in evidence_spans:
-                        if isinstance(span, (list, tuple)) and len(span) == 2:
-                            try:
-                                valid_spans.append([int(span[0]), int(span[1])])
-                            except (ValueError, TypeError):
-                                pass  # Skip invalid spans
-                    result_item["evidence_spans"] = valid_spans
-                    evidence_spans = valid_spans
+                # Filter out invalid spans (must be [int, int] with 2 elements).
+                # Tool Use normally returns well-formed spans, which are left untouched.
+                if evidence_spans and not all(
+                    type(span) is list and len(span) == 2 and type(span[0]) is int and type(span[1]) is int
+                    for span in evidence_spans
+                ):
+                    evidence_spans = [pair for pair in map(_safe_int_pair, evidence_spans) if pair is not None]
+                    result_item["evidence_spans"] = evidence_spans
 
                 if evidence_quote and not evidence_spans:
                     clean_quote = evidence_quote.strip()
                     if clean_quote:
-                        pos = full_transcript.find(clean_quote)
-                        if pos != -1:
-                            result_item["evidence_spans"] = [[pos, pos + len(clean_quote)]]
-                        else:
-                            short_quote = clean_quote[:50]
-                            pos = full_transcript.find(short_quote)
-                            if pos != -1:
-                                result_item["evidence_spans"] = [[pos, pos + len(clean_quote)]]
-                            else:
-                                result_item["evidence_spans"] = []
-                                helper.log_json("WARNING", "EVIDENCE_QUOTE_NOT_FOUND",
-                                               meetingId=meeting_id,
-                                               check_id=result_item.get("id"),
-                                               quote_preview=clean_quote[:100])
+                        pending_quotes.append((result_item, clean_quote))
+
+        # One pass over the transcript for all quotes, then one for the 50-char prefixes that missed
+        quote_positions = _find_first_positions(full_transcript, {q for _, q in pending_quotes})
+        short_positions = _find_first_positions(
+            full_transcript, {q[:50] for _, q in pending_quotes if q not in quote_positions}
+        )
+        for result_item, clean_quote in pending_quotes:
+            pos = quote_positions.get(clean_quote)
+            if pos is None:
+                pos = short_positions.get(clean_quote[:50])
+            if pos is not None:
+                result_item["evidence_spans"] = [[pos, pos + len(clean_quote)]]
+            else:
+                result_item["evidence_spans"] = []
+                helper.log_json("WARNING", "EVIDENCE_QUOTE_NOT_FOUND",
+                               meetingId=meeting_id,
+                               check_id=result_item.get("id"),
+                               quote_preview=clean_quote[:100])
 
     usage = resp.get("usage", {})
     cost_breakdown = helper.calculate_bedrock_cost(usage, model_id="claude-3-7-sonnet")
@@ -869,25 +967,26 @@ def lambda_handler(event, context):
 
     helper.log_json("INFO", "CASE_CHECK_LLM_OK", **log_data)
 
-    # Validate with Pydantic
-    parsed = CaseCheckPayload.model_validate(validated_json)
-    data = parsed.model_dump()
-
-    data["meeting_id"] = meeting_id
-    data["model_version"] = MODEL_VERSION
-    data["prompt_version"] = PROMPT_VERSION
+    # Validate with Pydantic (raises on schema violations); persist the validated payload so keys
+    # outside the schema never reach S3 or DynamoDB
+    data = asdict(_CASE_CHECK_PAYLOAD_ADAPTER.validate_python(validated_json))
 
-    severity_by_id = {c["id"]: c.get("severity", "low") for c in STARTER_SESSION_CHECKS}
-    has_high_severity_failures = False
+    results_list = data["results"]
+    failed_ids = []
+    high_severity_flags = []
     has_vulnerability = False
 
-    for r in data.get("results", []):
+    for r in results_list:
+        r.setdefault("evidence_spans", [])
         r["evidence_quote"] = r.get("evidence_quote") or ""
         r["comment"] = r.get("comment") or ""
         r["confidence"] = max(0.0, min(1.0, float(r.get("confidence", 0.0))))
 
-        if r.get("status") == "Fail" and severity_by_id.get(r.get("id")) == "high":
-            has_high_severity_failures = True
+        if r.get("status") == "Fail":
+            check_id = r.get("id", "")
+            failed_ids.append(check_id)
+            if _SEVERITY_BY_ID.get(check_id) == "high":
+                high_severity_flags.append(check_id)
 
         # Check if vulnerability exists (triggers detailed FCA FG21/1 assessment)
         # Trigger when: Competent (found & handled) OR Fail (found but not handled)
@@ -895,16 +994,34 @@ def lambda_handler(event, context):
         if r.get("id") == "vulnerability_identified" and r.get("status") in ["Competent", "Fail"]:
             has_vulnerability = True
 
-    data["overall"]["has_high_severity_failures"] = has_high_severity_failures
+    if overall_missing:
+        total_checks = len(results_list)
+        passed_count = total_checks - len(failed_ids)
+        pass_rate = (passed_count / total_checks * 100) if total_checks > 0 else 0.0
+
+        data["overall"] = {
+            "pass_rate": round(pass_rate, 1),
+            "failed_ids": failed_ids,
+            "high_severity_flags": high_severity_flags,
+        }
+
+        helper.log_json("INFO", "OVERALL_CALCULATED",
+                       meetingId=meeting_id,
+                       pass_rate=pass_rate,
+                       failed_count=len(failed_ids),
+                       high_severity_count=len(high_severity_flags))
+
+    data["overall"]["has_high_severity_failures"] = len(high_severity_flags) > 0
 
     # Add call analytics to case data
     data["call_analytics"] = call_analytics
 
-    # Save to S3
-    key = _save_case_json(meeting_id, data)
-
-    # Save to assessment-results DynamoDB table (for coach review & training data)
-    _save_checks_to_assessment_table(meeting_id, data, transcript_key, call_analytics)
+    # Save to S3 and to assessment-results DynamoDB table (for coach review & training data).
+    # The two sinks are independent, so write them concurrently; result() re-raises failures.
+    s3_future = _IO_EXECUTOR.submit(_save_case_json, meeting_id, data, now.year, now.month)
+    ddb_future = _IO_EXECUTOR.submit(_save_checks_to_assessment_table, meeting_id, data, transcript_key, call_analytics, now)
+    ddb_future.result()
+    key = s3_future.result()
 
     # Calculate pass rate
     pass_rate = float(data.get("overall", {}).get("pass_rate", 0.0))
@@ -23,6 +23,10 @@ bedrock_agent_runtime = AWSClients.bedrock_agent_runtime()
 _CATEGORY_CACHE: Dict[str, tuple[datetime, List[Dict]]] = {}
 _CACHE_DURATION = timedelta(hours=1)  # Adjust based on KB update frequency
 
+# Formatted prompt block per (kb_id, check_ids, max_per_check); the checklist is static, so warm
+# invocations reuse the string without re-walking the category cache or re-formatting
+_FORMATTED_CACHE: Dict[tuple, tuple[datetime, str]] = {}
+
 
 def retrieve_examples_for_check(
     check_id: str,
@@ -278,6 +282,7 @@ def clear_cache():
     """
     global _CATEGORY_CACHE
     _CATEGORY_CACHE.clear()
+    _FORMATTED_CACHE.clear()
     helper.log_json("INFO", "KB_CACHE_CLEARED")
 
 
@@ -327,6 +332,11 @@ def retrieve_and_format_examples(
     Returns:
         Formatted examples string for prompt
     """
+    cache_key = (kb_id, tuple(check_ids), max_per_check)
+    cached = _FORMATTED_CACHE.get(cache_key)
+    if cached and datetime.now() - cached[0] < _CACHE_DURATION:
+        return cached[1]
+
     # Strategy: Instead of querying for each check individually (expensive),
     # retrieve category-level examples that cover multiple checks
 
@@ -347,17 +357,26 @@ def retrieve_and_format_examples(
     ]
 
     all_examples = []
+    complete = True
 
     # Retrieve compliance examples (reduced to 1 for performance)
     has_compliance = any(c in compliance_checks for c in check_ids)
     if has_compliance:
         compliance_examples = retrieve_examples_by_category("compliance", max_results=1, kb_id=kb_id)
         all_examples.extend(compliance_examples)
+        complete = complete and bool(compliance_examples)
 
     # Retrieve macro/quality examples (reduced to 1 for performance)
     has_macro = any(c in macro_checks for c in check_ids)
     if has_macro:
         macro_examples = retrieve_examples_by_category("macro", max_results=1, kb_id=kb_id)
         all_examples.extend(macro_examples)
+        complete = complete and bool(macro_examples)
+
+    formatted = format_examples_for_prompt(all_examples)
 
-    return format_examples_for_prompt(all_examples)
+    # Only cache when every category returned examples, so a failed retrieval is retried next call
+    if complete and all_examples:
+        _FORMATTED_CACHE[cache_key] = (datetime.now(), formatted)
+
+    return formatted
@@ -55,6 +55,15 @@ ZOOM_PARAM_PREFIX = os.getenv("ZOOM_PARAM_PREFIX", DEFAULT_ZOOM_PARAM_PREFIX)
 SAVE_TRANSCRIPTS = os.getenv("SAVE_TRANSCRIPTS", "false").lower() == "true"
 ATHENA_PARTITIONED = os.getenv("ATHENA_PARTITIONED", "true").lower() == "true"
 
+# S3 key template for case check JSON (partitioned or flat layout); format with year, month, meeting_id
+if ATHENA_PARTITIONED:
+    CASE_CHECK_KEY_TEMPLATE = f"{S3_PREFIX}/supplementary/version={SCHEMA_VERSION}/year={{year}}/month={{month:02d}}/meeting_id={{meeting_id}}/case_check.v{CASE_CHECK_SCHEMA_VERSION}.json"
+else:
+    CASE_CHECK_KEY_TEMPLATE = f"{S3_PREFIX}/{{year:04d}}/{{month:02d}}/{{meeting_id}}/case_check.v{CASE_CHECK_SCHEMA_VERSION}.json"
+
+# Error codes S3 returns for a missing key (HEAD gives a bare 404, GET gives NoSuchKey)
+S3_NOT_FOUND_CODES = ("404", "NoSuchKey", "NotFound")
+
 # A2I Configuration
 A2I_FLOW_ARN_CASE = os.getenv("A2I_FLOW_ARN_CASE")
 A2I_PORTAL_URL = os.getenv("A2I_PORTAL_URL", "")
\ No newline at end of file
@@ -18,16 +18,23 @@ Storage:
 - Metrics are saved to S3 as call_metrics.json alongside transcript/case/summary files
 - This allows both case_check and summary workflows to access the same metrics
 """
-import json
+import orjson
 import re
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Optional, Tuple
 from utils import helper
 from utils.error_handler import lambda_error_handler, ValidationError
 from constants import SUMMARY_BUCKET, S3_PREFIX, SCHEMA_VERSION, ATHENA_PARTITIONED
 
-s3 = boto3.client("s3")
+# One client shared across worker threads; pool sized above the executor so parallel GETs never queue
+s3 = boto3.client("s3", config=Config(max_pool_connections=16))
+
+# Fetches the candidate months' metrics objects in parallel
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=4)
 
 
 def get_transcript_from_s3(s3_key: str) -> str:
@@ -51,59 +58,111 @@ def get_vtt_from_s3(transcript_key: str) -> Optional[str]:
         return None
 
 
-def parse_timestamp(ts: str) -> float:
-    """Parse VTT timestamp to seconds."""
-    ts = ts.replace(',', '.').strip()
-    parts = ts.split(':')
-    if len(parts) == 3:
-        h, m, s = parts
-        return int(h) * 3600 + int(m) * 60 + float(s)
-    elif len(parts) == 2:
-        m, s = parts
-        return int(m) * 60 + float(s)
-    return 0.0
+# Pattern to match timestamp lines: "00:00:00.000 --> 00:00:05.123"
+# Captures h, m, s, fraction for start and end so no per-timestamp string parsing is needed.
+# Callers test for '-->' first: most lines are cue text, and the substring check is far cheaper
+# than entering the regex engine (google-re2 was measured ~20x slower for these short per-line matches).
+# Leading whitespace is absorbed by the pattern so raw lines can be matched without stripping.
+_TIMESTAMP_PATTERN = re.compile(
+    r'\s*(\d{1,2}):(\d{2}):(\d{2})[.,](\d+)\s*-->\s*(\d{1,2}):(\d{2}):(\d{2})[.,](\d+)'
+)
+
+
+def _cue_times(match: re.Match) -> Tuple[float, float]:
+    """Start and end seconds from a _TIMESTAMP_PATTERN match."""
+    h1, m1, s1, f1, h2, m2, s2, f2 = match.groups()
+    # (s * 10^k + frac) / 10^k is the correctly rounded float of "s.frac", exactly as float() parses it
+    scale1 = 10 ** len(f1)
+    scale2 = 10 ** len(f2)
+    start_sec = int(h1) * 3600 + int(m1) * 60 + (int(s1) * scale1 + int(f1)) / scale1
+    end_sec = int(h2) * 3600 + int(m2) * 60 + (int(s2) * scale2 + int(f2)) / scale2
+    return start_sec, end_sec
 
 
-def parse_vtt_segments(vtt_content: str) -> list:
+def parse_vtt_full(vtt_content: str, coach_name: Optional[str] = None) -> Tuple[float, float, float, int, int]:
     """
-    Parse VTT file into segments with start time, end time, and text.
-    Returns list of (start_sec, end_sec, text) tuples.
+    Single pass over a VTT file computing duration and speaker timing together.
+
+    A segment is a timestamp line followed by its text lines, up to a blank line, the next
+    timestamp line or a cue number; segments without text are skipped. Segment text is
+    attributed to the speaker named before its first colon ("John Smith: Hello"), falling
+    back to the client when there is no 2-50 character speaker prefix.
+
+    Returns (total_duration_sec, coach_duration_sec, client_duration_sec, coach_words, client_words).
+    Speaker fields are zero when coach_name is not provided.
     """
     if not vtt_content:
-        return []
+        return 0.0, 0.0, 0.0, 0, 0
 
     # Normalize line endings
     vtt_content = vtt_content.replace('\r\n', '\n').replace('\r', '\n')
 
-    segments = []
-    # Pattern to match timestamp lines: "00:00:00.000 --> 00:00:05.123"
-    timestamp_pattern = re.compile(r'(\d{1,2}:\d{2}:\d{2}[.,]\d+)\s*-->\s*(\d{1,2}:\d{2}:\d{2}[.,]\d+)')
+    timestamp_pattern = _TIMESTAMP_PATTERN
+    coach_name_lower = coach_name.lower().strip() if coach_name else None
+    coach_by_speaker = {}
+
+    total_duration_sec = 0.0
+    coach_duration_sec = 0.0
+    client_duration_sec = 0.0
+    coach_words = 0
+    client_words = 0
 
     lines = vtt_content.split('\n')
+    n = len(lines)
     i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        match = timestamp_pattern.match(line)
-        if match:
-            start_sec = parse_timestamp(match.group(1))
-            end_sec = parse_timestamp(match.group(2))
-
-            # Collect text lines until blank line or next timestamp
-            text_lines = []
+    while i < n:
+        line = lines[i]
+        match = timestamp_pattern.match(line) if '-->' in line else None
+        if not match:
             i += 1
-            while i < len(lines):
-                text_line = lines[i].strip()
-                if not text_line or timestamp_pattern.match(text_line) or text_line.isdigit():
-                    break
-                text_lines.append(text_line)
-                i += 1
-
-            if text_lines:
-                segments.append((start_sec, end_sec, ' '.join(text_lines)))
-        else:
+            continue
+
+        # Collect text lines until blank line or next timestamp
+        text_lines = []
+        i += 1
+        while i < n:
+            text_line = lines[i].strip()
+            if not text_line or ('-->' in text_line and timestamp_pattern.match(text_line)) or text_line.isdigit():
+                break
+            text_lines.append(text_line)
             i += 1
 
-    return segments
+        if not text_lines:
+            continue
+
+        start_sec, end_sec = _cue_times(match)
+        total_duration_sec = end_sec  # End time of last segment
+        if coach_name_lower is None:
+            continue
+
+        segment_duration = end_sec - start_sec
+        vtt_text = ' '.join(text_lines)
+
+        # Try to extract speaker from the text: "Speaker Name: actual text", where the name is
+        # everything before the first colon and must be 2-50 characters long
+        colon = vtt_text.find(':')
+        if 2 <= colon <= 50:
+            word_count = len(vtt_text[colon + 1:].split())
+
+            # Check if this speaker is the coach (decided once per distinct speaker label)
+            speaker_label = vtt_text[:colon]
+            is_coach = coach_by_speaker.get(speaker_label)
+            if is_coach is None:
+                speaker_name = speaker_label.strip().lower()
+                is_coach = coach_name_lower in speaker_name or speaker_name in coach_name_lower
+                coach_by_speaker[speaker_label] = is_coach
+            if is_coach:
+                coach_duration_sec += segment_duration
+                coach_words += word_count
+            else:
+                client_duration_sec += segment_duration
+                client_words += word_count
+        else:
+            # No speaker prefix - default to client for unattributed segments
+            client_duration_sec += segment_duration
+            client_words += len(vtt_text.split())
+
+    return total_duration_sec, coach_duration_sec, client_duration_sec, coach_words, client_words
 
 
 def get_vtt_duration(vtt_content: str) -> float:
@@ -111,14 +170,7 @@ def get_vtt_duration(vtt_content: str) -> float:
     Extract total call duration from VTT file by finding the last timestamp.
     Returns duration in seconds.
     """
-    if not vtt_content:
-        return 0.0
-
-    segments = parse_vtt_segments(vtt_content)
-    if segments:
-        return segments[-1][1]  # End time of last segment
-
-    return 0.0
+    return parse_vtt_full(vtt_content)[0]
 
 
 def parse_vtt_with_speakers(vtt_content: str, coach_name: str) -> dict:
@@ -134,48 +186,7 @@ def parse_vtt_with_speakers(vtt_content: str, coach_name: str) -> dict:
         - coach_words: Total words spoken by coach
         - client_words: Total words spoken by client
     """
-    if not vtt_content or not coach_name:
-        return {
-            'coach_duration_sec': 0.0,
-            'client_duration_sec': 0.0,
-            'coach_words': 0,
-            'client_words': 0,
-        }
-
-    segments = parse_vtt_segments(vtt_content)
-    coach_name_lower = coach_name.lower().strip()
-
-    coach_duration_sec = 0.0
-    client_duration_sec = 0.0
-    coach_words = 0
-    client_words = 0
-
-    # Pattern to extract speaker name from VTT text: "Speaker Name: actual text"
-    speaker_pattern = re.compile(r'^([^:]{2,50}):\s*(.*)$')
-
-    for start_sec, end_sec, vtt_text in segments:
-        segment_duration = end_sec - start_sec
-
-        # Try to extract speaker from the text
-        match = speaker_pattern.match(vtt_text)
-        if match:
-            speaker_name = match.group(1).strip().lower()
-            actual_text = match.group(2).strip()
-            word_count = len(actual_text.split()) if actual_text else 0
-
-            # Check if this speaker is the coach
-            if coach_name_lower in speaker_name or speaker_name in coach_name_lower:
-                coach_duration_sec += segment_duration
-                coach_words += word_count
-            else:
-                client_duration_sec += segment_duration
-                client_words += word_count
-        else:
-            # No speaker prefix - count words but can't attribute
-            word_count = len(vtt_text.split()) if vtt_text else 0
-            # Default to client for unattributed segments
-            client_duration_sec += segment_duration
-            client_words += word_count
+    _, coach_duration_sec, client_duration_sec, coach_words, client_words = parse_vtt_full(vtt_content, coach_name or None)
 
     return {
         'coach_duration_sec': coach_duration_sec,
@@ -206,18 +217,13 @@ def extract_metrics(transcript: str, vtt_content: Optional[str] = None, coach_na
         - client_speaking_pct: Percentage of speaking time for client
         - coach_wpm: Coach's words per minute
     """
-    # Get total duration from VTT
-    vtt_segments = parse_vtt_segments(vtt_content) if vtt_content else []
-    total_duration_sec = vtt_segments[-1][1] if vtt_segments else 0.0
+    # Get total duration and speaker timing from VTT in one pass
+    (total_duration_sec, coach_duration_sec, client_duration_sec,
+     coach_words, client_words) = parse_vtt_full(vtt_content, coach_name or None)
     total_duration_min = total_duration_sec / 60.0
 
     # If we have VTT and coach name, use VTT timestamps for accurate timing
     if vtt_content and coach_name:
-        timing = parse_vtt_with_speakers(vtt_content, coach_name)
-        coach_duration_sec = timing['coach_duration_sec']
-        client_duration_sec = timing['client_duration_sec']
-        coach_words = timing['coach_words']
-        client_words = timing['client_words']
 
         coach_speaking_time_min = coach_duration_sec / 60.0
         client_speaking_time_min = client_duration_sec / 60.0
@@ -242,18 +248,13 @@ def extract_metrics(transcript: str, vtt_content: Optional[str] = None, coach_na
         client_words = 0
 
         for line in transcript.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-            match = re.match(r'^(COACH|CLIENT):\s*(.*)$', line)
-            if match:
-                speaker = match.group(1)
-                text = match.group(2).strip()
-                word_count = len(text.split()) if text else 0
-                if speaker == 'COACH':
-                    coach_words += word_count
-                else:
-                    client_words += word_count
+            line = line.lstrip()
+
+            # Fixed speaker prefixes - cheaper than a regex match per line
+            if line.startswith('COACH:'):
+                coach_words += len(line[6:].split())
+            elif line.startswith('CLIENT:'):
+                client_words += len(line[7:].split())
 
         total_words = coach_words + client_words
 
@@ -283,19 +284,24 @@ def extract_metrics(transcript: str, vtt_content: Optional[str] = None, coach_na
     }
 
 
-def save_metrics_to_s3(meeting_id: str, call_metrics: dict, year: int = None, month: int = None) -> str:
+def _metrics_key(meeting_id: str, year: int, month: int) -> str:
+    """S3 key for a meeting's call_metrics.json in the given year/month partition."""
+    if ATHENA_PARTITIONED:
+        return f"{S3_PREFIX}/call_metrics/version={SCHEMA_VERSION}/year={year}/month={month:02d}/meeting_id={meeting_id}/call_metrics.json"
+    return f"{S3_PREFIX}/{year}/{month:02d}/{meeting_id}/call_metrics.json"
+
+
+def save_metrics_to_s3(meeting_id: str, call_metrics: dict, year: int = None, month: int = None,
+                       now: datetime = None) -> str:
     """
     Save call metrics to S3 as JSON (alongside transcript/case/summary files).
     Returns the S3 key where metrics were saved.
     """
-    now = datetime.now(timezone.utc)
+    now = now or datetime.now(timezone.utc)
     year = year or now.year
     month = month or now.month
 
-    if ATHENA_PARTITIONED:
-        key = f"{S3_PREFIX}/call_metrics/version={SCHEMA_VERSION}/year={year}/month={month:02d}/meeting_id={meeting_id}/call_metrics.json"
-    else:
-        key = f"{S3_PREFIX}/{year}/{month:02d}/{meeting_id}/call_metrics.json"
+    key = _metrics_key(meeting_id, year, month)
 
     # Add metadata
     payload = {
@@ -307,7 +313,7 @@ def save_metrics_to_s3(meeting_id: str, call_metrics: dict, year: int = None, mo
     s3.put_object(
         Bucket=SUMMARY_BUCKET,
         Key=key,
-        Body=json.dumps(payload, indent=2).encode("utf-8"),
+        Body=orjson.dumps(payload),
         ContentType="application/json",
     )
 
@@ -315,35 +321,42 @@ def save_metrics_to_s3(meeting_id: str, call_metrics: dict, year: int = None, mo
     return key
 
 
-def load_metrics_from_s3(meeting_id: str) -> Optional[dict]:
+def _load_metrics_key(key: str) -> Optional[dict]:
+    """Load a saved call metrics document from a single S3 key, or None if it doesn't exist."""
+    try:
+        response = s3.get_object(Bucket=SUMMARY_BUCKET, Key=key)
+        return orjson.loads(response['Body'].read())
+    except ClientError as e:
+        # A missing key is the normal miss path; anything else is unexpected but must not block extraction
+        if not helper.is_s3_not_found(e):
+            helper.log_json("WARN", "METRICS_LOAD_FAILED", s3Key=key, error=str(e))
+        return None
+    except Exception as e:
+        helper.log_json("WARN", "METRICS_LOAD_FAILED", s3Key=key, error=str(e))
+        return None
+
+
+def load_metrics_from_s3(meeting_id: str, now: datetime = None) -> Optional[dict]:
     """
     Try to load existing call metrics from S3.
     Returns metrics dict if found, None otherwise.
     """
-    now = datetime.now(timezone.utc)
+    now = now or datetime.now(timezone.utc)
 
     # Try current and previous months
-    for month_offset in [0, -1, -2]:
-        try_month = now.month + month_offset
-        try_year = now.year
-        if try_month < 1:
-            try_month += 12
-            try_year -= 1
-
-        if ATHENA_PARTITIONED:
-            key = f"{S3_PREFIX}/call_metrics/version={SCHEMA_VERSION}/year={try_year}/month={try_month:02d}/meeting_id={meeting_id}/call_metrics.json"
-        else:
-            key = f"{S3_PREFIX}/{try_year}/{try_month:02d}/{meeting_id}/call_metrics.json"
-
-        try:
-            response = s3.get_object(Bucket=SUMMARY_BUCKET, Key=key)
-            data = json.loads(response['Body'].read().decode('utf-8'))
+    keys = [_metrics_key(meeting_id, year, month) for year, month in helper.recent_months(now, 3)]
+
+    # Probe all months concurrently with GETs (a miss costs one round trip whichever month it is,
+    # and a hit needs no follow-up request); the most recent month that exists wins
+    futures = [_IO_EXECUTOR.submit(_load_metrics_key, key) for key in keys]
+    for i, (key, future) in enumerate(zip(keys, futures)):
+        data = future.result()
+        if data is not None:
+            # Older months are no longer needed; drop any probe that hasn't started yet
+            for pending in futures[i + 1:]:
+                pending.cancel()
             helper.log_json("INFO", "METRICS_LOADED_FROM_S3", meetingId=meeting_id, s3Key=key)
             return data.get('metrics')
-        except s3.exceptions.NoSuchKey:
-            continue
-        except Exception:
-            continue
 
     return None
 
@@ -379,9 +392,12 @@ def lambda_handler(event, context):
     if not meeting_id:
         raise ValidationError("meetingId is required")
 
+    # Single clock read: the cache lookup and the save must agree on the month partition
+    now = datetime.now(timezone.utc)
+
     # Check if metrics already exist (skip re-extraction unless forced)
     if not force_reprocess:
-        existing_metrics = load_metrics_from_s3(meeting_id)
+        existing_metrics = load_metrics_from_s3(meeting_id, now=now)
         if existing_metrics:
             helper.log_json("INFO", "USING_CACHED_METRICS", meetingId=meeting_id)
             return {
@@ -392,19 +408,19 @@ def lambda_handler(event, context):
                 "metricsKey": "cached"
             }
 
-    # Fetch transcript from S3
+    # Fetch transcript and VTT (for accurate timing calculation) from S3 concurrently
     helper.log_json("INFO", "LOADING_TRANSCRIPT", meetingId=meeting_id, transcriptKey=transcript_key)
-    transcript = get_transcript_from_s3(transcript_key)
-
-    # Fetch VTT for accurate timing calculation
-    vtt_content = get_vtt_from_s3(transcript_key)
+    transcript_future = _IO_EXECUTOR.submit(get_transcript_from_s3, transcript_key)
+    vtt_future = _IO_EXECUTOR.submit(get_vtt_from_s3, transcript_key)
+    transcript = transcript_future.result()
+    vtt_content = vtt_future.result()
     has_vtt = vtt_content is not None
 
     # Extract all metrics (VTT + coach_name enables accurate timing)
     call_metrics = extract_metrics(transcript, vtt_content, coach_name)
 
     # Save metrics to S3 for reuse by other workflows
-    metrics_key = save_metrics_to_s3(meeting_id, call_metrics)
+    metrics_key = save_metrics_to_s3(meeting_id, call_metrics, now=now)
 
     helper.log_json("INFO", "METRICS_EXTRACTED",
                     meetingId=meeting_id,
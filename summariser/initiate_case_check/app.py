@@ -1,7 +1,12 @@
 # summariser/initiate_case_check/app.py
+import gzip
 import json
+import orjson
 import boto3
-from botocore.exceptions import ClientError
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.config import Config
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 import os
 import logging
@@ -12,6 +17,8 @@ from utils.error_handler import (
     lambda_error_handler, InputValidator, ValidationError,
     ExternalServiceError, handle_s3_error
 )
+from utils import helper
+from utils.ttl_cache import TTLCache
 from utils.retry_handler import DynamoDBRetryWrapper, with_s3_retry
 from constants import *
 
@@ -19,12 +26,50 @@ from constants import *
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# AWS clients with retry wrappers
-s3 = boto3.client("s3")
-sfn = boto3.client("stepfunctions")
+# Keep pooled sockets alive between warm invocations so each call skips a fresh TLS handshake.
+# Retries stay with the with_s3_retry / DynamoDBRetryWrapper handlers rather than botocore.
+client_config = Config(tcp_keepalive=True, max_pool_connections=10)
+
+# AWS clients are created on first use (then reused across warm invocations), so a cold start
+# doesn't pay for clients the request never touches
+_s3_client = None
+_sfn_client = None
+_dynamodb_wrapper = None
+
+def _s3():
+    """S3 client"""
+    global _s3_client
+    if _s3_client is None:
+        _s3_client = boto3.client("s3", config=client_config)
+    return _s3_client
+
+def _sfn():
+    """Step Functions client"""
+    global _sfn_client
+    if _sfn_client is None:
+        _sfn_client = boto3.client("stepfunctions", config=client_config)
+    return _sfn_client
+
+def _dynamodb() -> DynamoDBRetryWrapper:
+    """Job table with retry wrapper"""
+    global _dynamodb_wrapper
+    if _dynamodb_wrapper is None:
+        _dynamodb_wrapper = DynamoDBRetryWrapper(
+            SUMMARY_JOB_TABLE, client=boto3.resource("dynamodb", config=client_config)
+        )
+    return _dynamodb_wrapper
+
+# Probes the fallback months for an existing case check in parallel
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=4)
 
-# DynamoDB with retry wrapper
-dynamodb_wrapper = DynamoDBRetryWrapper(SUMMARY_JOB_TABLE)
+# Converts low-level attribute values (as returned on a failed condition) to Python types
+_deserializer = TypeDeserializer()
+
+# Completed case checks seen recently, so clients polling the endpoint don't each cost a DynamoDB
+# write: meeting_id -> case check data. Only COMPLETED results are held
+COMPLETED_CACHE_TTL_SECONDS = 5
+COMPLETED_CACHE_MAX = 1024
+_completed_cache = TTLCache(COMPLETED_CACHE_MAX, COMPLETED_CACHE_TTL_SECONDS)
 
 # Step Functions State Machine ARN
 STATE_MACHINE_ARN = os.environ.get("CASE_CHECK_STATE_MACHINE_ARN", "")
@@ -91,57 +136,31 @@ def lambda_handler(event, context):
     # Extract force reprocess option from request (optional)
     force_reprocess = bool(body.get("forceReprocess", False))
 
-    # 1) Fast path: case check already completed? Return existing data
-    if not force_reprocess:
-        existing_data = _get_existing_case_check(meeting_id)
-        if existing_data:
-            logger.info(f"Case check already exists for meeting {meeting_id}, returning existing data")
-
-            # Fetch the full case check data from S3 if key is available
-            case_check_full_data = None
-            case_check_key = existing_data.get("caseCheckKey")
-            if case_check_key and case_check_key != "found_in_s3":
-                try:
-                    response = s3.get_object(Bucket=SUMMARY_BUCKET, Key=case_check_key)
-                    case_check_full_data = json.loads(response['Body'].read().decode('utf-8'))
-                except Exception as e:
-                    logger.warning(f"Failed to fetch case check data from S3: {e}")
-
-            response_data = {
-                "message": "Case check already completed",
-                "meetingId": meeting_id,
-                "caseCheckKey": case_check_key,
-                "casePassRate": existing_data.get("casePassRate"),
-                "caseCheckStatus": existing_data.get("caseCheckStatus"),
-                "completed": True
-            }
-
-            if case_check_full_data:
-                response_data["data"] = case_check_full_data
-
-            return _response(200, response_data)
-
     if force_reprocess:
         logger.info(f"Force reprocess enabled for meeting {meeting_id}")
 
-    # 2) Mark QUEUED (allow overwriting COMPLETED if force_reprocess)
+    # Whether a completed case check is returned with its full JSON (default on). Callers that only
+    # need the status can pass includeFullData=false (body or query string) to skip the S3 read;
+    # the report itself stays available from GET /case
+    query_params = event.get("queryStringParameters") or {}
+    include_full_data = body.get("includeFullData", query_params.get("includeFullData", True))
+    if isinstance(include_full_data, str):
+        include_full_data = include_full_data.strip().lower() not in ("false", "0", "no")
+    include_full_data = bool(include_full_data)
+
+    # 1) Mark QUEUED (allow overwriting COMPLETED if force_reprocess)
+    # Fast path: a completed case check fails the conditional write, which hands back the stored item
     try:
         _mark_queued(meeting_id, force=force_reprocess)
     except ValidationError as e:
-        # Race condition: case check completed between initial check and queue
-        # Return existing data if available in error details
         if e.details and e.details.get("completed"):
-            logger.info(f"Case check completed during processing, returning existing data")
+            logger.info(f"Case check already exists for meeting {meeting_id}, returning existing data")
 
-            # Fetch full data from S3
+            # Fetch the full case check data from S3 if key is available
             case_check_full_data = None
             case_check_key = e.details.get("caseCheckKey")
-            if case_check_key:
-                try:
-                    response = s3.get_object(Bucket=SUMMARY_BUCKET, Key=case_check_key)
-                    case_check_full_data = json.loads(response['Body'].read().decode('utf-8'))
-                except Exception as fetch_error:
-                    logger.warning(f"Failed to fetch case check data from S3: {fetch_error}")
+            if include_full_data and case_check_key and case_check_key != "found_in_s3":
+                case_check_full_data = _fetch_case_check(_s3(), case_check_key)
 
             response_data = {
                 "message": "Case check already completed",
@@ -159,7 +178,7 @@ def lambda_handler(event, context):
         # Otherwise re-raise
         raise
 
-    # 3) Start Step Functions execution
+    # 2) Start Step Functions execution
     execution_arn = _start_step_function(
         meeting_id=meeting_id,
         coach_name=coach_name,
@@ -173,6 +192,36 @@ def lambda_handler(event, context):
 
 # ---------- Helpers ----------
 
+def _fetch_case_check(s3, key: str) -> dict:
+    """Load a case check JSON document from S3, or None if it can't be read"""
+    try:
+        response = s3.get_object(Bucket=SUMMARY_BUCKET, Key=key)
+        body = response['Body'].read()
+        # Documents may be stored gzip-compressed (Content-Encoding: gzip)
+        if response.get('ContentEncoding') == 'gzip':
+            body = gzip.decompress(body)
+        return orjson.loads(body)
+    except Exception as e:
+        logger.warning(f"Failed to fetch case check data from S3: {e}")
+        return None
+
+def _completed_case_check(item: dict) -> dict:
+    """
+    Summarise a job table item's case check.
+    Returns dict with case check data if completed, otherwise None.
+    """
+    # Check if case check workflow is completed (separate from summary workflow)
+    case_check_status = (item.get("caseCheckStatus") or "").upper()
+    has_case_check = bool(item.get("caseCheckKey"))
+
+    if case_check_status == "COMPLETED" and has_case_check:
+        return {
+            "caseCheckStatus": case_check_status,
+            "caseCheckKey": item.get("caseCheckKey"),
+            "casePassRate": float(item.get("casePassRate", 0.0))
+        }
+    return None
+
 def _get_existing_case_check(meeting_id: str) -> dict:
     """
     Get existing case check data if completed.
@@ -180,54 +229,87 @@ def _get_existing_case_check(meeting_id: str) -> dict:
     """
     try:
         # Try DynamoDB first (fast path)
-        res = dynamodb_wrapper.get_item(Key={"meetingId": meeting_id})
-        item = res.get("Item") or {}
-
-        # Check if case check workflow is completed (separate from summary workflow)
-        case_check_status = (item.get("caseCheckStatus") or "").upper()
-        has_case_check = bool(item.get("caseCheckKey"))
-
-        if case_check_status == "COMPLETED" and has_case_check:
-            return {
-                "caseCheckStatus": case_check_status,
-                "caseCheckKey": item.get("caseCheckKey"),
-                "casePassRate": float(item.get("casePassRate", 0.0))
-            }
-        return None
-    except Exception as e:
+        res = _dynamodb().get_item(Key={"meetingId": meeting_id})
+        return _completed_case_check(res.get("Item") or {})
+    except (ClientError, BotoConnectionError, HTTPClientError) as e:
+        if not _dynamodb_unavailable(e):
+            raise
         logger.warning(f"DynamoDB check failed for {meeting_id}, trying S3 fallback: {e}")
-
-        # If DDB is unavailable, fall back to S3 best-effort (SAM local skips)
-        if os.environ.get("AWS_SAM_LOCAL") == "true":
-            return None
-
-        # Check S3 for case check file
-        if _check_s3_case_check_completion(meeting_id):
-            return {"caseCheckStatus": "COMPLETED", "caseCheckKey": "found_in_s3", "casePassRate": 0.0}
-        return None
+        return _get_s3_case_check(meeting_id)
+
+# DynamoDB error codes meaning the table can't currently be reached. Throttling is retried by
+# DynamoDBRetryWrapper, and anything else (access denied, bad request) won't be helped by S3
+_DYNAMODB_UNAVAILABLE_ERRORS = ("ServiceUnavailable", "ServiceUnavailableException", "InternalServerError", "RequestLimitExceeded")
+
+def _dynamodb_unavailable(error: Exception) -> bool:
+    """Whether a DynamoDB failure is an outage the S3 fallback can stand in for"""
+    if isinstance(error, ClientError):
+        return error.response.get("Error", {}).get("Code", "") in _DYNAMODB_UNAVAILABLE_ERRORS
+    # Connection failures and timeouts
+    return isinstance(error, (BotoConnectionError, HTTPClientError))
+
+def _get_s3_case_check(meeting_id: str) -> dict:
+    """Best-effort completion check against S3 for when DynamoDB is unavailable (or under SAM local)"""
+    # Check S3 for case check file
+    if _check_s3_case_check_completion(meeting_id):
+        return {"caseCheckStatus": "COMPLETED", "caseCheckKey": "found_in_s3", "casePassRate": 0.0}
+    return None
+
+# Months (including the current one) the S3 fallback looks back for an existing case check
+S3_FALLBACK_MONTHS = 12
+
+def _s3_key_exists(s3, key: str) -> bool:
+    """HEAD a single key; a missing object is False, any other error propagates"""
+    try:
+        s3.head_object(Bucket=SUMMARY_BUCKET, Key=key)
+        return True
+    except ClientError as e:
+        if helper.is_s3_not_found(e):
+            return False
+        raise
 
 @with_s3_retry()
 def _check_s3_case_check_completion(meeting_id: str) -> bool:
     """Check S3 for existing case check (fallback method)"""
     try:
-        prefix = f"{S3_PREFIX}/"
-        schema = CASE_CHECK_SCHEMA_VERSION
-        paginator = s3.get_paginator("list_objects_v2")
-
-        for page in paginator.paginate(Bucket=SUMMARY_BUCKET, Prefix=prefix, MaxKeys=1000):
-            for obj in page.get("Contents", []):
-                key = obj["Key"]
-                if key.endswith(f"/{meeting_id}/case_check.v{schema}.json"):
-                    return True
-        return False
+        # The key only varies by year/month partition, so HEAD each candidate month concurrently
+        # rather than listing every object under the prefix
+        now = datetime.now(timezone.utc)
+        keys = [
+            helper.case_check_key(meeting_id, year, month)
+            for year, month in helper.recent_months(now, S3_FALLBACK_MONTHS)
+        ]
+        # Create the client here rather than racing to create it from the worker threads
+        s3 = _s3()
+        futures = [_IO_EXECUTOR.submit(_s3_key_exists, s3, key) for key in keys]
+        try:
+            return any(future.result() for future in futures)
+        finally:
+            # Drop any probe that hasn't started once the answer is known
+            for future in futures:
+                future.cancel()
     except Exception as e:
         handle_s3_error(e, SUMMARY_BUCKET, correlation_id=meeting_id)
         return False
 
+def _already_completed(meeting_id: str, existing_data: dict) -> ValidationError:
+    """Special exception carrying the existing case check, for the caller to catch"""
+    return ValidationError(
+        "Case check already completed",
+        details={
+            "completed": True,
+            "meetingId": meeting_id,
+            "caseCheckKey": existing_data.get("caseCheckKey"),
+            "casePassRate": existing_data.get("casePassRate"),
+            "caseCheckStatus": existing_data.get("caseCheckStatus")
+        }
+    )
+
 def _mark_queued(meeting_id: str, force: bool = False) -> None:
     """
     Mark meeting case check as queued in DynamoDB.
     Uses update_item to preserve other workflow data (like summary status).
+    Raises ValidationError with details["completed"] when the case check is already completed.
 
     Args:
         meeting_id: The meeting identifier
@@ -237,12 +319,29 @@ def _mark_queued(meeting_id: str, force: bool = False) -> None:
 
     if os.environ.get("AWS_SAM_LOCAL") == "true":
         logger.info(f"🧪 [Mock] Would set caseCheckStatus=QUEUED for {meeting_id} (force={force})")
+        if not force:
+            # Nothing is written locally, so a completed case check can only be found in S3
+            try:
+                existing_data = _get_s3_case_check(meeting_id)
+            except Exception as e:
+                logger.warning(f"🧪 [Mock] S3 completion check failed for {meeting_id}: {e}")
+                existing_data = None
+            if existing_data:
+                raise _already_completed(meeting_id, existing_data)
         return
 
+    if force:
+        # The case check is about to be re-run
+        _completed_cache.pop(meeting_id, None)
+    else:
+        cached = _completed_cache.get(meeting_id)
+        if cached:
+            raise _already_completed(meeting_id, cached)
+
     try:
         if force:
             # Force reprocess: unconditionally overwrite the caseCheckStatus
-            dynamodb_wrapper.update_item(
+            _dynamodb().update_item(
                 Key={"meetingId": meeting_id},
                 UpdateExpression="SET caseCheckStatus = :status, caseCheckUpdatedAt = :updated, createdAt = if_not_exists(createdAt, :created)",
                 ExpressionAttributeValues={
@@ -254,7 +353,7 @@ def _mark_queued(meeting_id: str, force: bool = False) -> None:
             logger.info(f"Marked case check {meeting_id} as QUEUED (force overwrite)")
         else:
             # Normal path: don't clobber COMPLETED caseCheckStatus
-            dynamodb_wrapper.update_item(
+            _dynamodb().update_item(
                 Key={"meetingId": meeting_id},
                 UpdateExpression="SET caseCheckStatus = :status, caseCheckUpdatedAt = :updated, createdAt = if_not_exists(createdAt, :created)",
                 ConditionExpression="attribute_not_exists(caseCheckStatus) OR caseCheckStatus <> :done",
@@ -263,41 +362,45 @@ def _mark_queued(meeting_id: str, force: bool = False) -> None:
                     ":updated": now_iso,
                     ":created": now_iso,
                     ":done": "COMPLETED"
-                }
+                },
+                # A failed condition returns the stored item, so no separate read is needed
+                ReturnValuesOnConditionCheckFailure="ALL_OLD"
             )
             logger.info(f"Marked case check {meeting_id} as QUEUED")
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "")
+    except (ClientError, BotoConnectionError, HTTPClientError) as e:
+        # Connection failures and timeouts carry no error code but still get the S3 fallback below
+        error_code = e.response.get("Error", {}).get("Code", "") if isinstance(e, ClientError) else ""
+        existing_data = None
         if error_code == "ConditionalCheckFailedException":
-            # Case check completed between our check and this write (race condition)
-            # Return the existing data instead of erroring
-            logger.warning(f"Case check {meeting_id} completed during check, fetching existing data")
-            existing_data = _get_existing_case_check(meeting_id)
-            if existing_data:
-                # Raise special exception with data that caller can catch
-                raise ValidationError(
-                    "Case check already completed",
-                    details={
-                        "completed": True,
-                        "meetingId": meeting_id,
-                        "caseCheckKey": existing_data.get("caseCheckKey"),
-                        "casePassRate": existing_data.get("casePassRate"),
-                        "caseCheckStatus": existing_data.get("caseCheckStatus")
-                    }
+            # Case check already completed: return the existing data instead of erroring
+            old_item = e.response.get("Item")
+            if old_item is not None:
+                existing_data = _completed_case_check(
+                    {k: _deserializer.deserialize(v) for k, v in old_item.items()}
                 )
             else:
-                # Shouldn't happen, but handle defensively
-                raise ValidationError(
-                    f"Case check already completed for meeting {meeting_id}. Use forceReprocess=true to re-run.",
-                    field="forceReprocess"
-                )
-        else:
-            # Re-raise other DynamoDB errors
-            raise ExternalServiceError(
-                f"Failed to mark case check as queued: {e}",
-                service="dynamodb",
-                correlation_id=meeting_id
+                existing_data = _get_existing_case_check(meeting_id)
+            if existing_data:
+                _completed_cache[meeting_id] = existing_data
+        elif not force and _dynamodb_unavailable(e):
+            # DynamoDB unavailable: a completed case check may still be found in S3
+            logger.warning(f"DynamoDB update failed for {meeting_id}, trying S3 fallback: {e}")
+            existing_data = _get_s3_case_check(meeting_id)
+
+        if existing_data:
+            raise _already_completed(meeting_id, existing_data)
+        if error_code == "ConditionalCheckFailedException":
+            # Completed without a case check key: nothing to return
+            raise ValidationError(
+                f"Case check already completed for meeting {meeting_id}. Use forceReprocess=true to re-run.",
+                field="forceReprocess"
             )
+        # Re-raise other DynamoDB errors
+        raise ExternalServiceError(
+            f"Failed to mark case check as queued: {e}",
+            service="dynamodb",
+            correlation_id=meeting_id
+        )
 
 def _start_step_function(
     meeting_id: str,
@@ -334,10 +437,10 @@ def _start_step_function(
         return f"arn:aws:states:eu-west-2:000000000000:execution:case-checker-workflow:mock-{meeting_id}"
 
     try:
-        response = sfn.start_execution(
+        response = _sfn().start_execution(
             stateMachineArn=STATE_MACHINE_ARN,
             name=f"case-check-{meeting_id}-{int(datetime.now(timezone.utc).timestamp())}",
-            input=json.dumps(input_data)
+            input=orjson.dumps(input_data).decode('utf-8')
         )
         logger.info(f"Case check workflow started for meeting {meeting_id}: {response['executionArn']}")
         return response['executionArn']
@@ -354,5 +457,5 @@ def _response(status_code: int, body: dict):
     return {
         "statusCode": status_code,
         "headers": {"Content-Type": "application/json"},
-        "body": json.dumps(body),
+        "body": orjson.dumps(body).decode('utf-8'),
     }
@@ -2,7 +2,8 @@
 AWS Client Management - Centralized boto3 client creation
 
 This module provides singleton boto3 clients to avoid duplicate initialization
-across Lambda functions. Clients are created once per Lambda container lifecycle.
+across Lambda functions. Clients are created once per Lambda container lifecycle,
+all from one shared Session (single credential resolution per container).
 """
 import boto3
 from typing import Optional
@@ -12,6 +13,7 @@ from constants import AWS_REGION
 class AWSClients:
     """Singleton manager for AWS service clients"""
 
+    _session: Optional[boto3.session.Session] = None
     _bedrock_runtime: Optional[object] = None
     _bedrock_agent_runtime: Optional[object] = None
     _s3: Optional[object] = None
@@ -20,63 +22,78 @@ class AWSClients:
     _stepfunctions: Optional[object] = None
     _a2i: Optional[object] = None
     _dynamodb: Optional[object] = None
+    _dynamodb_resource: Optional[object] = None
+
+    @classmethod
+    def session(cls) -> boto3.session.Session:
+        """Get the shared boto3 Session all clients are created from"""
+        if cls._session is None:
+            cls._session = boto3.session.Session(region_name=AWS_REGION)
+        return cls._session
 
     @classmethod
     def bedrock_runtime(cls):
         """Get Bedrock Runtime client for model invocations"""
         if cls._bedrock_runtime is None:
-            cls._bedrock_runtime = boto3.client("bedrock-runtime", region_name=AWS_REGION)
+            cls._bedrock_runtime = cls.session().client("bedrock-runtime")
         return cls._bedrock_runtime
 
     @classmethod
     def bedrock_agent_runtime(cls):
         """Get Bedrock Agent Runtime client for Knowledge Base operations"""
         if cls._bedrock_agent_runtime is None:
-            cls._bedrock_agent_runtime = boto3.client("bedrock-agent-runtime", region_name=AWS_REGION)
+            cls._bedrock_agent_runtime = cls.session().client("bedrock-agent-runtime")
         return cls._bedrock_agent_runtime
 
     @classmethod
     def s3(cls):
         """Get S3 client for object storage operations"""
         if cls._s3 is None:
-            cls._s3 = boto3.client("s3", region_name=AWS_REGION)
+            cls._s3 = cls.session().client("s3")
         return cls._s3
 
     @classmethod
     def ssm(cls):
         """Get Systems Manager client for Parameter Store operations"""
         if cls._ssm is None:
-            cls._ssm = boto3.client("ssm", region_name=AWS_REGION)
+            cls._ssm = cls.session().client("ssm")
         return cls._ssm
 
     @classmethod
     def comprehend(cls):
         """Get Comprehend client for PII detection"""
         if cls._comprehend is None:
-            cls._comprehend = boto3.client("comprehend", region_name=AWS_REGION)
+            cls._comprehend = cls.session().client("comprehend")
         return cls._comprehend
 
     @classmethod
     def stepfunctions(cls):
         """Get Step Functions client for workflow orchestration"""
         if cls._stepfunctions is None:
-            cls._stepfunctions = boto3.client("stepfunctions", region_name=AWS_REGION)
+            cls._stepfunctions = cls.session().client("stepfunctions")
         return cls._stepfunctions
 
     @classmethod
     def a2i(cls):
         """Get SageMaker A2I Runtime client for human review workflows"""
         if cls._a2i is None:
-            cls._a2i = boto3.client("sagemaker-a2i-runtime", region_name=AWS_REGION)
+            cls._a2i = cls.session().client("sagemaker-a2i-runtime")
         return cls._a2i
 
     @classmethod
     def dynamodb(cls):
         """Get DynamoDB client for database operations"""
         if cls._dynamodb is None:
-            cls._dynamodb = boto3.client("dynamodb", region_name=AWS_REGION)
+            cls._dynamodb = cls.session().client("dynamodb")
         return cls._dynamodb
 
+    @classmethod
+    def dynamodb_resource(cls):
+        """Get DynamoDB resource for table-level operations"""
+        if cls._dynamodb_resource is None:
+            cls._dynamodb_resource = cls.session().resource("dynamodb")
+        return cls._dynamodb_resource
+
 
 # Convenience exports for backward compatibility
 def get_bedrock_client():
@@ -6,7 +6,7 @@ from datetime import datetime, timezone
 from botocore.exceptions import ClientError
 from botocore.config import Config
 import boto3
-from constants import AWS_REGION
+from constants import AWS_REGION, CASE_CHECK_KEY_TEMPLATE, S3_NOT_FOUND_CODES
 
 # AWS client with timeout configuration
 # read_timeout: Maximum time to wait for Bedrock to return a response (important for long inference)
@@ -16,7 +16,15 @@ bedrock_config = Config(
     connect_timeout=10,
     retries={'max_attempts': 0}  # We handle retries manually in bedrock_converse()
 )
-bedrock = boto3.client("bedrock-runtime", region_name=AWS_REGION, config=bedrock_config)
+# Created on first use, so Lambdas that only need the small helpers here don't pay for it on a cold start
+_bedrock_client = None
+
+def _bedrock():
+    """Bedrock runtime client"""
+    global _bedrock_client
+    if _bedrock_client is None:
+        _bedrock_client = boto3.client("bedrock-runtime", region_name=AWS_REGION, config=bedrock_config)
+    return _bedrock_client
 
 # Claude 3.7 Sonnet pricing (AWS Bedrock, as of 2025)
 BEDROCK_PRICING = {
@@ -89,6 +97,22 @@ def log_json(level: str, msg: str, **kwargs):
         # never fail logging
         print(f"{level.upper()} {msg} {kwargs}")
 
+
+def recent_months(now: datetime, count: int) -> list:
+    """(year, month) for the current month and the count - 1 before it, newest first."""
+    index = now.year * 12 + now.month - 1
+    return [((index - i) // 12, (index - i) % 12 + 1) for i in range(count)]
+
+
+def case_check_key(meeting_id: str, year: int, month: int) -> str:
+    """S3 key for a meeting's case check JSON in the given year/month."""
+    return CASE_CHECK_KEY_TEMPLATE.format(year=year, month=month, meeting_id=meeting_id)
+
+
+def is_s3_not_found(err: ClientError) -> bool:
+    """True if an S3 ClientError just means the key doesn't exist."""
+    return err.response.get("Error", {}).get("Code") in S3_NOT_FOUND_CODES
+
 def _should_retry_bedrock_error(err: Exception) -> bool:
     if isinstance(err, ClientError):
         code = err.response.get("Error", {}).get("Code", "")
@@ -174,7 +198,7 @@ def bedrock_converse(
                     }
 
             # Call Converse API
-            resp = bedrock.converse(**request_params)
+            resp = _bedrock().converse(**request_params)
             latency_ms = round((time.perf_counter() - t0) * 1000, 2)
             return resp, latency_ms
 
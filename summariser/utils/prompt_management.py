@@ -24,10 +24,77 @@ def _get_bedrock_agent():
     return bedrock_agent
 
 
+# Parameter Store values are cached per Lambda container but expire after a TTL,
+# so warm containers pick up parameter updates without an SSM call per invocation
+SSM_CACHE_TTL_SECONDS = 300
+
+# Cache for SSM parameters: name -> (value, expiry epoch)
+_ssm_cache: Dict[str, Tuple[str, float]] = {}
+
+
+def get_ssm_cached(name: str, ttl: int = SSM_CACHE_TTL_SECONDS) -> str:
+    """
+    Get a Parameter Store value with Lambda container caching (TTL-based).
+
+    Args:
+        name: SSM parameter name
+        ttl: Seconds before the cached value is re-read from Parameter Store
+
+    Returns:
+        Parameter value
+
+    Raises:
+        Any SSM client error on a cache miss (callers decide how to degrade)
+    """
+    now = time.time()
+    cached = _ssm_cache.get(name)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    ssm = AWSClients.ssm()
+    response = ssm.get_parameter(Name=name, WithDecryption=False)
+    value = response['Parameter']['Value']
+    _ssm_cache[name] = (value, now + ttl)
+    helper.log_json("INFO", "SSM_PARAMETER_LOADED", parameter_name=name, ttl_seconds=ttl)
+    return value
+
+
+def prefetch_ssm_parameters(names: List[Optional[str]], ttl: int = SSM_CACHE_TTL_SECONDS) -> None:
+    """
+    Warm the SSM cache for several parameters with a single GetParameters call.
+
+    Intended for Lambda cold start. Best-effort: names missing from the response
+    (or a failed call) fall back to individual lookups in get_ssm_cached.
+
+    Args:
+        names: SSM parameter names (None entries are ignored, max 10 names)
+        ttl: Seconds before the cached values are re-read from Parameter Store
+    """
+    names = [name for name in names if name]
+    if not names:
+        return
+
+    try:
+        ssm = AWSClients.ssm()
+        response = ssm.get_parameters(Names=names, WithDecryption=False)
+    except Exception as e:
+        helper.log_json("WARNING", "SSM_PREFETCH_FAILED", parameter_names=names, error=str(e))
+        return
+
+    expires_at = time.time() + ttl
+    for param in response.get('Parameters', []):
+        _ssm_cache[param['Name']] = (param['Value'], expires_at)
+
+    helper.log_json("INFO", "SSM_PARAMETERS_PREFETCHED",
+                   loaded=len(response.get('Parameters', [])),
+                   invalid=response.get('InvalidParameters', []))
+
+
 def get_prompt_arn_from_parameter_store(
     param_name: str,
     cache_dict: Dict[str, Optional[str]],
-    use_prompt_management: bool = True
+    use_prompt_management: bool = True,
+    ttl: int = SSM_CACHE_TTL_SECONDS
 ) -> Optional[str]:
     """
     Get prompt ARN from Parameter Store with Lambda container caching.
@@ -36,6 +103,7 @@ def get_prompt_arn_from_parameter_store(
         param_name: SSM parameter name
         cache_dict: Cache dictionary (module-level)
         use_prompt_management: Whether prompt management is enabled
+        ttl: Seconds before the cached ARN is re-read from Parameter Store
 
     Returns:
         Prompt ARN or None
@@ -45,22 +113,21 @@ def get_prompt_arn_from_parameter_store(
     if not use_prompt_management:
         return None
 
-    if cache_key in cache_dict and cache_dict[cache_key] is not None:
-        return cache_dict[cache_key]
-
     try:
-        ssm = AWSClients.ssm()
-        response = ssm.get_parameter(Name=param_name)
-        cache_dict[cache_key] = response['Parameter']['Value']
-        helper.log_json("INFO", "PROMPT_ARN_LOADED",
-                       parameter_name=param_name,
-                       prompt_arn=cache_dict[cache_key])
-        return cache_dict[cache_key]
+        prompt_arn = get_ssm_cached(param_name, ttl=ttl)
     except Exception as e:
         helper.log_json("WARNING", "PROMPT_ARN_LOAD_FAILED",
                        parameter_name=param_name,
                        error=str(e))
-        return None
+        # Keep serving the previous ARN if a refresh fails
+        return cache_dict.get(cache_key)
+
+    if cache_dict.get(cache_key) != prompt_arn:
+        cache_dict[cache_key] = prompt_arn
+        helper.log_json("INFO", "PROMPT_ARN_LOADED",
+                       parameter_name=param_name,
+                       prompt_arn=prompt_arn)
+    return prompt_arn
 
 
 def _parse_prompt_arn(prompt_arn: str) -> Tuple[str, Optional[str]]:
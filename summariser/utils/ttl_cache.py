@@ -0,0 +1,81 @@
+"""
+Bounded TTL cache for values kept across warm Lambda invocations.
+
+Standard library only, so it can be imported from the Lambdas (utils.ttl_cache)
+and from the scripts under utilities/ (summariser.utils.ttl_cache).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Dict-like cache holding at most maxsize entries, each expiring ttl seconds after it was set
+    (or after its own ttl, if given to set). Beyond maxsize the oldest entries are evicted first.
+    Safe to share between threads.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()  # key -> (value, time.monotonic() expiry)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expiry = item
+            if time.monotonic() >= expiry:
+                del self._data[key]
+                return default
+            return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+        if item is None or time.monotonic() >= item[1]:
+            return default
+        return item[0]
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def set(self, key, value, ttl: float = None):
+        """Store value under key for ttl seconds (the cache's ttl by default)."""
+        now = time.monotonic()
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (value, now + (self.ttl if ttl is None else ttl))
+            # Drop expired entries from the front, then the oldest live ones beyond maxsize
+            while self._data:
+                oldest_key, (_, expiry) = next(iter(self._data.items()))
+                if expiry > now and len(self._data) <= self.maxsize:
+                    break
+                del self._data[oldest_key]
+
+    def __len__(self) -> int:
+        """Number of live entries (expired ones are purged first)."""
+        now = time.monotonic()
+        with self._lock:
+            for key in [key for key, (_, expiry) in self._data.items() if expiry <= now]:
+                del self._data[key]
+            return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
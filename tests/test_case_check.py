@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the case check Lambda
+
+Tests call analytics, evidence quote search, Knowledge Base ID lookup, reuse of an
+existing case check, the validated payload that gets saved and the assessment-results
+records written for each case check.
+"""
+
+import os
+import random
+import re
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+# Add path for imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'summariser'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-west-2')
+os.environ.setdefault('ASSESSMENT_RESULTS_TABLE', 'assessment-results-test')
+
+import boto3
+import orjson
+from moto import mock_aws
+
+
+class TestSaveChecksToAssessmentTable(unittest.TestCase):
+    """Test per-check and overall assessment items"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.mock = mock_aws()
+        cls.mock.start()
+        cls.table = boto3.resource('dynamodb').create_table(
+            TableName=os.environ['ASSESSMENT_RESULTS_TABLE'],
+            KeySchema=[
+                {'AttributeName': 'meeting_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'assessment_id', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'meeting_id', 'AttributeType': 'S'},
+                {'AttributeName': 'assessment_id', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        from case_check import app
+        cls.app = app
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.mock.stop()
+
+    def _save(self, meeting_id, statuses):
+        case_data = {
+            'results': [{'id': check_id, 'status': status, 'confidence': 0.9} for check_id, status in statuses.items()],
+            'overall': {'pass_rate': 50.0}
+        }
+        self.app._save_checks_to_assessment_table(meeting_id, case_data, 'summaries/transcript.txt')
+
+    def _items(self, meeting_id):
+        items = self.table.query(
+            KeyConditionExpression=boto3.dynamodb.conditions.Key('meeting_id').eq(meeting_id)
+        )['Items']
+        return {item['assessment_id']: item for item in items}
+
+    def test_every_check_gets_an_item(self):
+        """Competent checks are written alongside the ones needing review"""
+        self._save('mtg-all', {'call_recording_confirmed': 'Competent', 'fees_explained': 'Fail'})
+
+        items = self._items('mtg-all')
+        self.assertEqual(items['case-check#call_recording_confirmed']['result'], 'Competent')
+        self.assertEqual(items['case-check#fees_explained']['result'], 'Fail')
+        self.assertEqual(items['case-check#overall']['competent_ids'], ['call_recording_confirmed'])
+        self.assertEqual(items['case-check#overall']['failed_ids'], ['fees_explained'])
+
+    def test_reprocess_overwrites_check_now_competent(self):
+        """A check that went from Fail to Competent on reprocess doesn't leave its old Fail item behind"""
+        self._save('mtg-reprocess', {'fees_explained': 'Fail'})
+        self._save('mtg-reprocess', {'fees_explained': 'Competent'})
+
+        items = self._items('mtg-reprocess')
+        self.assertEqual(items['case-check#fees_explained']['result'], 'Competent')
+        self.assertEqual(items['case-check#overall']['failed_question_count'], 0)
+        self.assertEqual(items['case-check#overall']['triage_outcome'], 'Pass')
+
+    def test_pass_rate_stored_exactly(self):
+        """A model-supplied pass rate isn't rounded on its way into DynamoDB"""
+        case_data = {'results': [{'id': 'fees_explained', 'status': 'Fail'}], 'overall': {'pass_rate': 86.67}}
+        self.app._save_checks_to_assessment_table('mtg-pass-rate', case_data, 'summaries/transcript.txt')
+
+        self.assertEqual(self._items('mtg-pass-rate')['case-check#overall']['pass_rate'], Decimal('86.67'))
+
+    def test_call_analytics_stored_exactly(self):
+        """Analytics floats keep their precision; ints and lists pass through"""
+        case_data = {'results': [], 'overall': {'pass_rate': 100.0}}
+        call_analytics = {'coach_talk_ratio': 61.25, 'total_duration_sec': 1830.123, 'total_words': 4200,
+                          'speakers_detected': ['COACH', 'CLIENT']}
+        self.app._save_checks_to_assessment_table('mtg-analytics', case_data, 'summaries/transcript.txt', call_analytics)
+
+        overall = self._items('mtg-analytics')['case-check#overall']
+        self.assertEqual(overall['coach_talk_ratio'], Decimal('61.25'))
+        self.assertEqual(overall['total_duration_sec'], Decimal('1830.123'))
+        self.assertEqual(overall['total_words'], 4200)
+        self.assertEqual(overall['speakers_detected'], ['COACH', 'CLIENT'])
+
+
+def _reference_speaker_counts(transcript):
+    """The original regex-per-line speaker count, kept as the reference behaviour"""
+    coach_words = client_words = coach_turns = client_turns = 0
+    last_speaker_type = None
+    for line in transcript.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        speaker_match = re.match(r'^(COACH|CLIENT):\s*(.*)$', line)
+        if speaker_match:
+            text = speaker_match.group(2).strip()
+            word_count = len(text.split()) if text else 0
+            if speaker_match.group(1) == 'COACH':
+                coach_words += word_count
+                if last_speaker_type != 'COACH':
+                    coach_turns += 1
+                    last_speaker_type = 'COACH'
+            else:
+                client_words += word_count
+                if last_speaker_type != 'CLIENT':
+                    client_turns += 1
+                    last_speaker_type = 'CLIENT'
+    return coach_words, client_words, coach_turns, client_turns
+
+
+class TestCallAnalytics(unittest.TestCase):
+    """Test speaker word and turn counting"""
+
+    @classmethod
+    def setUpClass(cls):
+        with mock_aws():
+            from case_check import app
+        cls.app = app
+
+    def _assert_matches_reference(self, transcript):
+        analytics = self.app.calculate_call_analytics(transcript)
+        coach_words, client_words, coach_turns, client_turns = _reference_speaker_counts(transcript)
+        self.assertEqual(
+            (analytics['coach_words'], analytics['client_words'], analytics['coach_turns'], analytics['client_turns']),
+            (coach_words, client_words, coach_turns, client_turns),
+            repr(transcript)
+        )
+
+    def test_unicode_whitespace_separates_words(self):
+        """NBSP and other unicode spaces split words, as str.split() does"""
+        analytics = self.app.calculate_call_analytics("COACH: save\xa0£100\xa0now\nCLIENT: ok\u2003then")
+        self.assertEqual(analytics['coach_words'], 3)
+        self.assertEqual(analytics['client_words'], 2)
+
+    def test_matches_reference_counts(self):
+        """Counts match the original regex implementation, including awkward whitespace and labels"""
+        fixed = [
+            "COACH: hello there\nCLIENT: hi\nCOACH: ok\n",
+            "  COACH:  indented\tline \r\nCLIENT:\r\n\nCLIENT: again\n",
+            "COACH: one\rCLIENT: two\u2028CLIENT: three\x0bfour\x1cfive\x85six",
+            "COACH:\xa0nbsp\u3000wide\nclient: lower case\nCOACHING: not a label\nCLIENT:x",
+            "", "\n\n", "COACH:", "CLIENT: é ü 💷 £5",
+        ]
+        for transcript in fixed:
+            self._assert_matches_reference(transcript)
+
+        rng = random.Random(7)
+        pieces = ['COACH:', 'CLIENT:', 'word', '£100', 'naïve', ' ', '  ', '\t', '\n', '\r', '\r\n',
+                  '\xa0', '\u2003', '\u2028', '\x0b', '\x1c', '\x85', 'COACH', ':']
+        for _ in range(500):
+            self._assert_matches_reference(''.join(rng.choice(pieces) for _ in range(rng.randint(0, 60))))
+
+
+class TestExistingCaseCheck(unittest.TestCase):
+    """Test the idempotency check that reuses a case check already saved this month"""
+
+    class Context:
+        aws_request_id = 'test-request'
+
+    def setUp(self):
+        self.mock = mock_aws()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        from case_check import app
+        self.app = app
+
+        s3 = boto3.client('s3')
+        s3.create_bucket(Bucket=app.SUMMARY_BUCKET,
+                         CreateBucketConfiguration={'LocationConstraint': os.environ['AWS_DEFAULT_REGION']})
+        self.s3_calls = []
+        s3.meta.events.register('before-call.s3.*', lambda model, **kwargs: self.s3_calls.append(model.name))
+        patcher = patch.object(app, 's3', s3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _case_key(self, meeting_id):
+        now = self.app.datetime.now(self.app.timezone.utc)
+        return self.app.helper.case_check_key(meeting_id, now.year, now.month)
+
+    def test_existing_case_check_read_with_one_get(self):
+        """A saved case check is returned from a single GET, with no HEAD first"""
+        case_data = {'results': [], 'overall': {'pass_rate': 87.5}}
+        self.app.s3.put_object(Bucket=self.app.SUMMARY_BUCKET, Key=self._case_key('mtg-existing'),
+                               Body=orjson.dumps(case_data))
+        self.s3_calls.clear()
+
+        result = self.app.lambda_handler(
+            {'meetingId': 'mtg-existing', 'redactedTranscriptKey': 'summaries/transcript.txt'}, self.Context()
+        )
+
+        self.assertEqual(result, {'caseData': case_data, 'caseKey': self._case_key('mtg-existing'), 'passRate': 87.5})
+        self.assertEqual(self.s3_calls, ['GetObject'])
+
+    def test_missing_case_check_goes_on_to_process(self):
+        """NoSuchKey is a miss: the transcript is fetched and the case check runs"""
+        with patch.object(self.app, 'get_transcript_from_s3', side_effect=RuntimeError('stop here')) as get_transcript, \
+                patch.object(self.app.helper, 'log_json') as log_json:
+            try:
+                self.app.lambda_handler(
+                    {'meetingId': 'mtg-new', 'redactedTranscriptKey': 'summaries/transcript.txt',
+                     'callMetrics': {'total_duration_sec': 60.0}},
+                    self.Context()
+                )
+            except RuntimeError:
+                pass
+
+        get_transcript.assert_called_once_with('summaries/transcript.txt')
+        self.assertEqual(self.s3_calls, ['GetObject'])
+        self.assertNotIn('CASE_CHECK_CHECK_FAILED', [call.args[1] for call in log_json.call_args_list])
+
+
+class TestCaseCheckPersisted(unittest.TestCase):
+    """Test that only the validated case check payload is saved"""
+
+    class Context:
+        aws_request_id = 'test-request'
+
+    def setUp(self):
+        self.mock = mock_aws()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        from case_check import app
+        self.app = app
+
+        s3 = boto3.client('s3')
+        s3.create_bucket(Bucket=app.SUMMARY_BUCKET,
+                         CreateBucketConfiguration={'LocationConstraint': os.environ['AWS_DEFAULT_REGION']})
+        table = boto3.resource('dynamodb').create_table(
+            TableName=os.environ['ASSESSMENT_RESULTS_TABLE'],
+            KeySchema=[
+                {'AttributeName': 'meeting_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'assessment_id', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'meeting_id', 'AttributeType': 'S'},
+                {'AttributeName': 'assessment_id', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        for name, value in (('s3', s3), ('assessment_table', table), ('get_kb_id', lambda: None),
+                            ('get_prompt_arn', lambda: 'arn:prompt'),
+                            ('get_transcript_from_s3', lambda key: 'COACH: This call is recorded.')):
+            patcher = patch.object(self.app, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.table = table
+
+    def _run(self, tool_input):
+        resp = {'output': {'message': {'content': [{'toolUse': {'input': tool_input}}]}},
+                'stopReason': 'tool_use', 'usage': {'inputTokens': 10, 'outputTokens': 10}}
+        with patch.object(self.app, 'invoke_with_prompt_management', return_value=(resp, 5)):
+            return self.app.lambda_handler(
+                {'meetingId': 'mtg-extra', 'redactedTranscriptKey': 'summaries/transcript.txt',
+                 'callMetrics': {'total_duration_sec': 60.0}},
+                self.Context()
+            )
+
+    def test_extra_keys_not_persisted(self):
+        """Keys outside the schema, at the top level or per result, are dropped before saving"""
+        result = self._run({
+            'reasoning': 'model scratch work',
+            'results': [{'id': 'call_recording_confirmed', 'status': 'Competent', 'confidence': 0.9,
+                         'evidence_spans': [[0, 10]], 'evidence_quote': 'This call', 'scratchpad': 'notes'}],
+            'overall': {'pass_rate': 100.0, 'failed_ids': [], 'high_severity_flags': []}
+        })
+
+        saved = orjson.loads(self.app.s3.get_object(Bucket=self.app.SUMMARY_BUCKET, Key=result['caseKey'])['Body'].read())
+        self.assertNotIn('reasoning', saved)
+        self.assertNotIn('scratchpad', saved['results'][0])
+        self.assertEqual(saved['results'][0], {
+            'id': 'call_recording_confirmed', 'status': 'Competent', 'confidence': 0.9,
+            'evidence_spans': [[0, 10]], 'evidence_quote': 'This call', 'comment': ''
+        })
+        self.assertEqual(saved['meeting_id'], 'mtg-extra')
+        self.assertNotIn('reasoning', result['caseData'])
+
+        item = self.table.get_item(
+            Key={'meeting_id': 'mtg-extra', 'assessment_id': 'case-check#call_recording_confirmed'}
+        )['Item']
+        self.assertNotIn('scratchpad', orjson.loads(item['ai_output']))
+        self.assertNotIn('scratchpad', item)
+
+
+class TestGetKbId(unittest.TestCase):
+    """Test Knowledge Base ID lookup and its failure caching"""
+
+    @classmethod
+    def setUpClass(cls):
+        with mock_aws():
+            from case_check import app
+        cls.app = app
+
+    def setUp(self):
+        self.app._kb_id_retry_at = 0.0
+        self.addCleanup(setattr, self.app, '_kb_id_retry_at', 0.0)
+        patcher = patch.object(self.app, 'USE_KB', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_failure_cached_for_ttl(self):
+        """A failed lookup isn't retried (or logged again) until the SSM cache TTL has passed"""
+        now = 1_000_000.0
+        with patch.object(self.app, 'get_ssm_cached', side_effect=Exception('ParameterNotFound')) as get_ssm, \
+                patch.object(self.app.helper, 'log_json') as log_json, \
+                patch.object(self.app.time, 'time', side_effect=lambda: now):
+            self.assertIsNone(self.app.get_kb_id())
+            now += self.app.SSM_CACHE_TTL_SECONDS - 1
+            self.assertIsNone(self.app.get_kb_id())
+            self.assertEqual(get_ssm.call_count, 1)
+            self.assertEqual(log_json.call_count, 1)
+
+            now += 1
+            self.assertIsNone(self.app.get_kb_id())
+            self.assertEqual(get_ssm.call_count, 2)
+
+    def test_success_after_retry(self):
+        """Once the failure has expired a successful lookup returns the ID"""
+        with patch.object(self.app, 'get_ssm_cached', side_effect=Exception('ParameterNotFound')):
+            self.assertIsNone(self.app.get_kb_id())
+        self.app._kb_id_retry_at = 0.0
+        with patch.object(self.app, 'get_ssm_cached', return_value='KB123'):
+            self.assertEqual(self.app.get_kb_id(), 'KB123')
+
+
+class TestFindFirstPositions(unittest.TestCase):
+    """Test the multi-phrase search used to locate evidence quotes"""
+
+    @classmethod
+    def setUpClass(cls):
+        with mock_aws():
+            from case_check import app
+        cls.app = app
+
+    def _assert_matches_str_find(self, text, needles):
+        expected = {needle: text.find(needle) for needle in needles if text.find(needle) != -1}
+        self.assertEqual(self.app._find_first_positions(text, set(needles)), expected, (text, needles))
+        with patch.object(self.app, 'AHOCORASICK_ENABLED', False):
+            self.assertEqual(self.app._find_first_positions(text, set(needles)), expected, (text, needles))
+
+    def test_overlapping_and_nested_phrases(self):
+        """Phrases that overlap, nest or repeat each get their own leftmost position"""
+        text = "COACH: the fee is £250 a year. CLIENT: the fee is fine. COACH: fees are reviewed yearly"
+        self._assert_matches_str_find(text, ["the fee is", "fee is £250", "fee", "fees", "£250", "a year", "year"])
+        self._assert_matches_str_find("aaaa", ["a", "aa", "aaa", "aaaa", "aaaaa"])
+        self._assert_matches_str_find("abcabd", ["abd", "bca", "cab", "abc", "zzz"])
+
+    def test_unicode_text(self):
+        """Positions are str indices, not byte offsets, with accented, wide and astral characters"""
+        text = "CLIENT: naïve question about the ISA — is it £20k? \U0001F4B7 COACH: yes, café prices été 投资"
+        self._assert_matches_str_find(text, ["naïve", "ISA — is", "£20k", "\U0001F4B7 COACH", "café", "投资", "cafe"])
+
+    def test_empty_and_single(self):
+        """No needles gives no positions; a single needle and an empty text behave like str.find"""
+        self.assertEqual(self.app._find_first_positions("anything", set()), {})
+        self._assert_matches_str_find("COACH: hello", ["hello"])
+        self._assert_matches_str_find("", ["hello", "world"])
+
+    def test_matches_str_find_random(self):
+        """Random needles drawn from and around random text agree with str.find"""
+        rng = random.Random(5)
+        alphabet = "ab é£\U0001F4B7\n"
+        for _ in range(300):
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            needles = set()
+            for _ in range(rng.randint(1, 8)):
+                if text and rng.random() < 0.7:
+                    start = rng.randrange(len(text))
+                    needles.add(text[start:start + rng.randint(1, 6)])
+                else:
+                    needles.add(''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))))
+            self._assert_matches_str_find(text, needles)
+
+
+if __name__ == '__main__':
+    unittest.main()
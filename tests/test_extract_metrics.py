@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the extract metrics Lambda
+
+Tests VTT parsing for call duration and speaker timing.
+"""
+
+import os
+import random
+import re
+import unittest
+
+# Add path for imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'summariser'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-west-2')
+
+from extract_metrics.app import parse_vtt_full, get_vtt_duration, parse_vtt_with_speakers
+
+
+def _reference_segments(vtt_content):
+    """The original two-pass segment parser, kept as the reference behaviour"""
+    if not vtt_content:
+        return []
+    vtt_content = vtt_content.replace('\r\n', '\n').replace('\r', '\n')
+    timestamp_pattern = re.compile(r'(\d{1,2}:\d{2}:\d{2}[.,]\d+)\s*-->\s*(\d{1,2}:\d{2}:\d{2}[.,]\d+)')
+
+    def parse_timestamp(ts):
+        h, m, s = ts.replace(',', '.').strip().split(':')
+        return int(h) * 3600 + int(m) * 60 + float(s)
+
+    segments = []
+    lines = vtt_content.split('\n')
+    i = 0
+    while i < len(lines):
+        match = timestamp_pattern.match(lines[i].strip())
+        if match:
+            text_lines = []
+            i += 1
+            while i < len(lines):
+                text_line = lines[i].strip()
+                if not text_line or timestamp_pattern.match(text_line) or text_line.isdigit():
+                    break
+                text_lines.append(text_line)
+                i += 1
+            if text_lines:
+                segments.append((parse_timestamp(match.group(1)), parse_timestamp(match.group(2)), ' '.join(text_lines)))
+        else:
+            i += 1
+    return segments
+
+
+def _reference_vtt_full(vtt_content, coach_name):
+    """Duration and speaker attribution over _reference_segments"""
+    segments = _reference_segments(vtt_content)
+    total_duration_sec = segments[-1][1] if segments else 0.0
+    coach_duration_sec = client_duration_sec = 0.0
+    coach_words = client_words = 0
+    if not coach_name:
+        return total_duration_sec, 0.0, 0.0, 0, 0
+
+    coach_name_lower = coach_name.lower().strip()
+    speaker_pattern = re.compile(r'^([^:]{2,50}):\s*(.*)$')
+    for start_sec, end_sec, vtt_text in segments:
+        match = speaker_pattern.match(vtt_text)
+        if match:
+            speaker_name = match.group(1).strip().lower()
+            word_count = len(match.group(2).split())
+            if coach_name_lower in speaker_name or speaker_name in coach_name_lower:
+                coach_duration_sec += end_sec - start_sec
+                coach_words += word_count
+                continue
+        else:
+            word_count = len(vtt_text.split())
+        client_duration_sec += end_sec - start_sec
+        client_words += word_count
+    return total_duration_sec, coach_duration_sec, client_duration_sec, coach_words, client_words
+
+
+class TestParseVttFull(unittest.TestCase):
+    """Test the single-pass VTT parser against the original segment rules"""
+
+    SAMPLE = (
+        "WEBVTT\n\n"
+        "1\n00:00:01.000 --> 00:00:04.500\nJane Smith: Hello, thanks for joining\n\n"
+        "2\n00:00:05.000 --> 00:00:09.250\nBob Jones: Hi Jane\nhappy to be here\n\n"
+        "3\n00:00:10.000 --> 00:00:12.000\n\n"
+        "4\n00:00:12,500 --> 00:01:02.125\nno speaker on this one\n"
+    )
+
+    def test_sample_duration_and_attribution(self):
+        """Duration is the last segment's end; cues are attributed by speaker prefix"""
+        total, coach_sec, client_sec, coach_words, client_words = parse_vtt_full(self.SAMPLE, 'Jane Smith')
+        self.assertEqual(total, 62.125)
+        self.assertEqual(coach_sec, 3.5)
+        self.assertEqual(client_sec, 4.25 + 49.625)
+        self.assertEqual(coach_words, 4)
+        self.assertEqual(client_words, 6 + 5)
+
+    def test_without_coach_name(self):
+        """Only the duration is computed when there is no coach name"""
+        self.assertEqual(parse_vtt_full(self.SAMPLE), (62.125, 0.0, 0.0, 0, 0))
+        self.assertEqual(get_vtt_duration(self.SAMPLE), 62.125)
+        self.assertEqual(parse_vtt_full(''), (0.0, 0.0, 0.0, 0, 0))
+
+    def test_matches_reference(self):
+        """Random VTT fragments parse exactly as the original segment parser and attribution did"""
+        pieces = ['00:00:01.000 --> 00:00:04.000', '1:02:03,5-->01:02:04.75', '00:01.000 --> 00:02.000',
+                  '\n', '\r\n', '\r', ' ', '12', 'Jane Smith: ', 'Bob:', 'hello world', 'x', '::', '  ',
+                  'WEBVTT', '\t', '00:00:09.000 --> 00:00:03.000 line:0', '00:00:05.1234 --> 00:00:06.5']
+        rng = random.Random(11)
+        for _ in range(2000):
+            vtt = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 25)))
+            for coach_name in ('Jane Smith', 'bob', None):
+                self.assertEqual(parse_vtt_full(vtt, coach_name), _reference_vtt_full(vtt, coach_name), repr(vtt))
+
+            _, coach_sec, client_sec, coach_words, client_words = _reference_vtt_full(vtt, 'Jane')
+            self.assertEqual(parse_vtt_with_speakers(vtt, 'Jane'), {
+                'coach_duration_sec': coach_sec,
+                'client_duration_sec': client_sec,
+                'coach_words': coach_words,
+                'client_words': client_words,
+            })
+
+
+if __name__ == '__main__':
+    unittest.main()
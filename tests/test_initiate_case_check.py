@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the initiate case check Lambda
+
+Tests how an already-completed case check is detected when queueing.
+"""
+
+import os
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+# Add path for imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'summariser'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-west-2')
+
+import boto3
+from botocore.exceptions import ClientError, EndpointConnectionError, ReadTimeoutError
+from moto import mock_aws
+
+
+class FailingTable:
+    """Stands in for the job table wrapper, failing every write with the given error"""
+
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+
+    def update_item(self, **kwargs):
+        self.calls += 1
+        raise self.error
+
+
+class TestMarkQueued(unittest.TestCase):
+    """Test _mark_queued's completed-case-check detection"""
+
+    def setUp(self):
+        self.mock = mock_aws()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        from initiate_case_check import app
+        self.app = app
+
+        self.s3 = boto3.client('s3')
+        self.s3.create_bucket(Bucket=app.SUMMARY_BUCKET,
+                              CreateBucketConfiguration={'LocationConstraint': os.environ['AWS_DEFAULT_REGION']})
+        for name, value in (('_s3_client', self.s3), ('_dynamodb_wrapper', None)):
+            patcher = patch.object(app, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        app._completed_cache.clear()
+        self.addCleanup(app._completed_cache.clear)
+
+    def _save_case_check(self, meeting_id):
+        now = datetime.now(timezone.utc)
+        self.s3.put_object(Bucket=self.app.SUMMARY_BUCKET, Key=self.app.helper.case_check_key(meeting_id, now.year, now.month),
+                           Body=b'{}')
+
+    def _assert_completed_from_s3(self, meeting_id, **kwargs):
+        with self.assertRaises(self.app.ValidationError) as raised:
+            self.app._mark_queued(meeting_id, **kwargs)
+        self.assertTrue(raised.exception.details['completed'])
+        self.assertEqual(raised.exception.details['caseCheckKey'], 'found_in_s3')
+
+    def test_connection_failure_falls_back_to_s3(self):
+        """A DynamoDB connection failure or timeout is checked against S3 rather than escaping"""
+        self._save_case_check('mtg-done')
+        for error in (EndpointConnectionError(endpoint_url='https://dynamodb'),
+                      ReadTimeoutError(endpoint_url='https://dynamodb')):
+            self.app._dynamodb_wrapper = FailingTable(error)
+            self._assert_completed_from_s3('mtg-done')
+
+    def test_connection_failure_without_s3_case_check(self):
+        """With nothing in S3 either, the connection failure is reported as a DynamoDB error"""
+        self.app._dynamodb_wrapper = FailingTable(EndpointConnectionError(endpoint_url='https://dynamodb'))
+        with self.assertRaises(self.app.ExternalServiceError):
+            self.app._mark_queued('mtg-new')
+
+    def test_other_client_errors_not_masked(self):
+        """Errors S3 can't stand in for (e.g. access denied) still fail without an S3 lookup"""
+        self._save_case_check('mtg-done')
+        self.app._dynamodb_wrapper = FailingTable(
+            ClientError({'Error': {'Code': 'AccessDeniedException'}}, 'UpdateItem')
+        )
+        with self.assertRaises(self.app.ExternalServiceError):
+            self.app._mark_queued('mtg-done')
+
+    def test_sam_local_finds_completed_case_check_in_s3(self):
+        """Under SAM local nothing is written, but a case check saved in S3 is still detected"""
+        self._save_case_check('mtg-done')
+        self.app._dynamodb_wrapper = FailingTable(AssertionError('no DynamoDB writes under SAM local'))
+        with patch.dict(os.environ, {'AWS_SAM_LOCAL': 'true'}):
+            self._assert_completed_from_s3('mtg-done')
+            self.assertIsNone(self.app._mark_queued('mtg-new'))
+            self.assertIsNone(self.app._mark_queued('mtg-done', force=True))
+        self.assertEqual(self.app._dynamodb_wrapper.calls, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared TTL cache
+
+Tests expiry, size-bounded eviction and concurrent use.
+"""
+
+import threading
+import unittest
+from unittest.mock import patch
+
+# Add path for imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'summariser'))
+
+from utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    """Stands in for time.monotonic so expiry can be stepped through deterministically"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+    """Test TTLCache behaviour"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch('utils.ttl_cache.time.monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_entry_expires_after_ttl(self):
+        """An entry is served until ttl seconds have passed, then it's gone"""
+        cache = TTLCache(maxsize=10, ttl=5)
+        cache['mtg1'] = {'caseCheckStatus': 'COMPLETED'}
+
+        self.clock.now += 4.9
+        self.assertEqual(cache.get('mtg1'), {'caseCheckStatus': 'COMPLETED'})
+        self.assertIn('mtg1', cache)
+
+        self.clock.now += 0.1
+        self.assertIsNone(cache.get('mtg1'))
+        self.assertNotIn('mtg1', cache)
+        self.assertEqual(cache.get('mtg1', 'default'), 'default')
+        with self.assertRaises(KeyError):
+            cache['mtg1']
+        self.assertEqual(len(cache), 0)
+
+    def test_setting_again_restarts_ttl(self):
+        """Re-setting a key gives it a fresh expiry"""
+        cache = TTLCache(maxsize=10, ttl=5)
+        cache['mtg1'] = 'old'
+        self.clock.now += 4
+        cache['mtg1'] = 'new'
+        self.clock.now += 4
+        self.assertEqual(cache['mtg1'], 'new')
+
+    def test_pop(self):
+        """pop removes the entry and returns it only while it's live"""
+        cache = TTLCache(maxsize=10, ttl=5)
+        cache['a'] = 1
+        cache['b'] = 2
+        self.assertEqual(cache.pop('a'), 1)
+        self.assertNotIn('a', cache)
+        self.assertIsNone(cache.pop('a'))
+
+        self.clock.now += 5
+        self.assertIsNone(cache.pop('b'))
+        self.assertEqual(len(cache), 0)
+
+    def test_oldest_entry_evicted_when_full(self):
+        """Beyond maxsize the least recently set entries are dropped first"""
+        cache = TTLCache(maxsize=3, ttl=60)
+        for key in ('a', 'b', 'c'):
+            cache[key] = key
+        cache['a'] = 'a2'  # moves 'a' to the back
+        cache['d'] = 'd'
+
+        self.assertEqual(len(cache), 3)
+        self.assertNotIn('b', cache)
+        self.assertEqual([cache.get(key) for key in ('a', 'c', 'd')], ['a2', 'c', 'd'])
+
+    def test_expired_entries_dropped_on_set(self):
+        """Expired entries are cleared out on the next write rather than holding their slots"""
+        cache = TTLCache(maxsize=3, ttl=5)
+        cache['a'] = 1
+        cache['b'] = 2
+        self.clock.now += 5
+        cache['c'] = 3
+
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache['c'], 3)
+
+    def test_per_entry_ttl(self):
+        """set can give an entry its own ttl; others keep the cache's"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set('short', 1, ttl=5)
+        cache['long'] = 2
+
+        self.clock.now += 5
+        self.assertNotIn('short', cache)
+        self.assertEqual(cache['long'], 2)
+
+    def test_len_counts_live_entries(self):
+        """len doesn't count entries that have expired but not yet been purged"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache['long'] = 1
+        cache.set('short', 2, ttl=5)
+        self.assertEqual(len(cache), 2)
+
+        self.clock.now += 5
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(len(cache._data), 1)
+
+    def test_clear(self):
+        """clear empties the cache"""
+        cache = TTLCache(maxsize=3, ttl=5)
+        cache['a'] = 1
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertNotIn('a', cache)
+
+
+class TestTTLCacheThreadSafety(unittest.TestCase):
+    """Test TTLCache shared between threads"""
+
+    def test_concurrent_reads_and_writes(self):
+        """Concurrent sets, gets and pops never corrupt the cache or exceed maxsize"""
+        cache = TTLCache(maxsize=50, ttl=60)
+        errors = []
+        start = threading.Barrier(8)
+
+        def worker(worker_id):
+            try:
+                start.wait()
+                for i in range(2000):
+                    key = (worker_id * 7 + i) % 120
+                    cache[key] = (worker_id, i)
+                    value = cache.get(key)
+                    if value is not None and not isinstance(value, tuple):
+                        errors.append(value)
+                    if i % 5 == 0:
+                        cache.pop((key + 1) % 120)
+                    if len(cache) > cache.maxsize:
+                        errors.append(len(cache))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(cache), 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Zoom API client
+
+Tests request sharing between concurrent callers, batch meeting lookup and what is cached.
+"""
+
+import os
+import random
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from urllib.parse import urlparse
+
+# Add path for imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-west-2')
+
+import boto3
+from moto import mock_aws
+
+from utilities import zoom_client
+from utilities.zoom_client import ZoomClient
+
+HOSTS = ['jane.smith@example.com', 'bob.jones@example.com', 'al.bo@example.com']
+USERS = [
+    {'first_name': 'Jane', 'last_name': 'Smith', 'display_name': 'Jane S', 'email': 'Jane.Smith@example.com'},
+    {'first_name': 'Bob', 'last_name': 'Jones', 'display_name': '', 'email': 'bob.jones@example.com'},
+    {'first_name': 'Al', 'last_name': 'Bo', 'display_name': 'Albo', 'email': 'AL.BO@example.com'},
+]
+
+
+def _recordings(date_str):
+    """Deterministic recordings for a date, including unparseable and incomplete meetings"""
+    rng = random.Random(date_str)
+    meetings = []
+    for _ in range(rng.randint(0, 25)):
+        topic = rng.choice(['Review with ', 'Call: ', '', 'mary k and ']) + \
+            rng.choice(['Mary K', 'tom p', 'SUE@EXAMPLE.ORG', 'sam lee', 'other'])
+        meeting = {
+            'id': rng.randint(10**9, 10**10),
+            'topic': topic,
+            'host_email': rng.choice(HOSTS + ['JANE.SMITH@example.com']),
+            'start_time': f"{date_str}T{rng.randint(6, 18):02d}:{rng.choice([0, 15, 30, 45]):02d}:00Z",
+        }
+        if rng.random() < 0.05:
+            meeting['start_time'] = 'not a time'
+        if rng.random() < 0.05:
+            del meeting['topic']
+        if rng.random() < 0.05:
+            del meeting['host_email']
+        meetings.append(meeting)
+    return meetings
+
+
+class FakeResponse:
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    """Answers the Zoom endpoints the client uses and records each request path"""
+
+    def __init__(self):
+        self.headers = {}
+        self.paths = []
+        self._lock = threading.Lock()
+
+    def post(self, url, **kwargs):
+        with self._lock:
+            self.paths.append(urlparse(url).path)
+        return FakeResponse(200, {'access_token': 'token', 'expires_in': 3600})
+
+    def get(self, url, params=None, **kwargs):
+        path = urlparse(url).path
+        with self._lock:
+            self.paths.append(path)
+        if path.endswith('/users'):
+            return FakeResponse(200, {'users': USERS, 'next_page_token': ''})
+        return FakeResponse(200, {'meetings': _recordings(params['from'])})
+
+
+class ZoomClientTestCase(unittest.TestCase):
+    """Builds a ZoomClient from mocked SSM credentials, talking to a FakeSession"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.mock = mock_aws()
+        cls.mock.start()
+        ssm = boto3.client('ssm', region_name='eu-west-2')
+        for key in ('account_id', 'client_id', 'client_secret'):
+            ssm.put_parameter(Name=f'{ZoomClient.SSM_PREFIX}/{key}', Value=f'{key}-value', Type='SecureString')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.mock.stop()
+
+    def _client(self, session=None):
+        client = ZoomClient()
+        client._session = session or FakeSession()
+        return client
+
+
+class TestSingleFlight(ZoomClientTestCase):
+    """Test that concurrent callers share one in-flight request"""
+
+    CALLERS = 5
+
+    def _run_concurrently(self, client, fetch):
+        """(outcomes, threads): each thread calls _single_flight('key', fetch) and records its outcome"""
+        outcomes = [None] * self.CALLERS
+
+        def call(index):
+            try:
+                outcomes[index] = ('ok', client._single_flight('key', fetch))
+            except Exception as e:
+                outcomes[index] = ('error', e)
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(self.CALLERS)]
+        return outcomes, threads
+
+    def test_concurrent_callers_share_one_request(self):
+        """Callers arriving while a fetch is running get its result without fetching again"""
+        client = self._client()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {'answer': 42}
+
+        outcomes, threads = self._run_concurrently(client, fetch)
+        threads[0].start()
+        self.assertTrue(started.wait(5))
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.2)  # let the followers reach the in-flight future
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(outcomes, [('ok', {'answer': 42})] * self.CALLERS)
+        self.assertTrue(all(outcome[1] is outcomes[0][1] for outcome in outcomes))
+        self.assertEqual(client._inflight, {})
+
+    def test_exception_reaches_every_waiter_and_later_calls_retry(self):
+        """A failed fetch raises in every waiting caller, and the next call fetches afresh"""
+        client = self._client()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def failing_fetch():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            raise RuntimeError('zoom unavailable')
+
+        outcomes, threads = self._run_concurrently(client, failing_fetch)
+        threads[0].start()
+        self.assertTrue(started.wait(5))
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(kind == 'error' and str(error) == 'zoom unavailable' for kind, error in outcomes))
+        self.assertEqual(client._inflight, {})
+
+        self.assertEqual(client._single_flight('key', lambda: 'recovered'), 'recovered')
+        self.assertEqual(client._inflight, {})
+
+    def test_concurrent_recordings_requests_share_one_listing(self):
+        """Concurrent get_recordings_for_date calls for one date make a single recordings request"""
+        gate = threading.Event()
+
+        class SlowSession(FakeSession):
+            def get(self, url, params=None, **kwargs):
+                if urlparse(url).path.endswith('/recordings'):
+                    gate.wait(5)
+                return super().get(url, params=params, **kwargs)
+
+        session = SlowSession()
+        client = self._client(session)
+        client.authenticate()
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client.get_recordings_for_date('2025-01-15')))
+            for _ in range(self.CALLERS)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.2)
+        gate.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(session.paths.count('/v2/accounts/me/recordings'), 1)
+        self.assertEqual(results, [_recordings('2025-01-15')] * self.CALLERS)
+
+
+class TestBatchFindMeetings(ZoomClientTestCase):
+    """Test that batch_find_meetings agrees with find_meeting query by query"""
+
+    CLIENTS = ['mary.k@example.org', 'tom_p@example.org', 'sue@example.org', 'Sam Lee', 'zed@example.org', '']
+    COACHES = ['Jane Smith', 'jane s', 'Bob Jones', 'Albo', 'Unknown Coach', None]
+
+    def _queries(self, seed, count):
+        rng = random.Random(seed)
+        queries = []
+        for _ in range(count):
+            call_datetime = f"2025-01-{rng.randint(13, 17):02d}T{rng.randint(5, 19):02d}:{rng.choice(['00', '20', '40'])}:00Z"
+            if rng.random() < 0.05:
+                call_datetime = 'not a date'
+            query = (rng.choice(self.CLIENTS), call_datetime)
+            coach_name = rng.choice(self.COACHES)
+            queries.append(query + (coach_name,) if coach_name or rng.random() < 0.5 else query)
+        return queries
+
+    def _assert_batch_matches_single(self, queries, time_window_hours=2.0):
+        # One client for the reference too: found meetings are cached per client, date and coach,
+        # so a later query for the same day gets the first one's match either way
+        single = self._client()
+        expected = [single.find_meeting(*query, time_window_hours=time_window_hours) for query in queries]
+        self.assertEqual(self._client().batch_find_meetings(queries, time_window_hours=time_window_hours), expected)
+
+    def test_matches_find_meeting(self):
+        """Each batch result is what find_meeting returns for that query, in query order"""
+        for seed in range(5):
+            self._assert_batch_matches_single(self._queries(seed, 80))
+        self._assert_batch_matches_single(self._queries('narrow', 80), time_window_hours=0.25)
+
+    def test_matches_find_meeting_without_ahocorasick(self):
+        """The per-query topic search gives the same results as the automaton"""
+        with patch.object(zoom_client, 'AHOCORASICK_ENABLED', False):
+            for seed in range(3):
+                self._assert_batch_matches_single(self._queries(seed, 80))
+
+    def test_repeated_and_cached_queries(self):
+        """Repeats share a result and queries answered earlier come from the meeting cache"""
+        client = self._client()
+        queries = [('mary.k@example.org', '2025-01-15T10:00:00Z', 'Jane Smith')] * 3 + \
+            [('tom_p@example.org', '2025-01-15T12:00:00Z')]
+        first = client.batch_find_meetings(queries)
+        self.assertEqual(first[0], first[1])
+        self.assertEqual(first[0], first[2])
+
+        requests_before = len(client._session.paths)
+        self.assertEqual(client.batch_find_meetings(queries), first)
+        self.assertEqual(len(client._session.paths), requests_before)
+        self.assertEqual(client.find_meeting(*queries[3]), first[3])
+
+    def test_empty_and_invalid(self):
+        """An empty batch returns nothing; an unparseable datetime is reported as invalid_date"""
+        client = self._client()
+        self.assertEqual(client.batch_find_meetings([]), [])
+        self.assertEqual(client.batch_find_meetings([('sue@example.org', 'yesterday')]), [(None, 'invalid_date')])
+
+
+class TestMissesNotCached(ZoomClientTestCase):
+    """Test that failures and misses aren't held by a client shared across warm invocations"""
+
+    class FlakySession(FakeSession):
+        """Recordings requests answer with the queued statuses first, then succeed"""
+
+        def __init__(self, statuses, meetings=None):
+            super().__init__()
+            self.statuses = list(statuses)
+            self.meetings = meetings
+
+        def get(self, url, params=None, **kwargs):
+            if urlparse(url).path.endswith('/recordings') and self.statuses:
+                with self._lock:
+                    self.paths.append(urlparse(url).path)
+                status = self.statuses.pop(0)
+                if isinstance(status, Exception):
+                    raise status
+                return FakeResponse(status, {'meetings': self.meetings or []})
+            return super().get(url, params=params, **kwargs)
+
+    def test_failed_recordings_fetch_retried(self):
+        """A 429 or request error gives no recordings this time, and the next call asks Zoom again"""
+        session = self.FlakySession([429, ConnectionError('timed out')])
+        client = self._client(session)
+
+        self.assertEqual(client.get_recordings_for_date('2025-01-15'), [])
+        self.assertEqual(client.get_recordings_for_date('2025-01-15'), [])
+        self.assertEqual(client.get_recordings_for_date('2025-01-15'), _recordings('2025-01-15'))
+        self.assertEqual(client.get_recordings_for_date('2025-01-15'), _recordings('2025-01-15'))
+        self.assertEqual(session.paths.count('/v2/accounts/me/recordings'), 3)
+
+    def test_failed_fetch_then_meeting_found(self):
+        """A lookup that failed to list recordings finds the meeting on the next call"""
+        query = ('mary.k@example.org', '2025-01-15T10:00:00Z')
+        expected = self._client().find_meeting(*query)
+        self.assertIsNotNone(expected[0])
+
+        client = self._client(self.FlakySession([503]))
+        self.assertEqual(client.find_meeting(*query), (None, 'no_recording'))
+        self.assertEqual(client.find_meeting(*query), expected)
+
+        client = self._client(self.FlakySession([503]))
+        self.assertEqual(client.batch_find_meetings([query]), [(None, 'no_recording')])
+        self.assertEqual(client.batch_find_meetings([query]), [expected])
+
+    def test_empty_listing_rechecked_soon(self):
+        """A day with no recordings yet is cached for seconds, not for the full recordings TTL"""
+        session = self.FlakySession([200])
+        client = self._client(session)
+        now = [time.monotonic()]
+        with patch('summariser.utils.ttl_cache.time.monotonic', lambda: now[0]):
+            self.assertEqual(client.get_recordings_for_date('2025-01-15'), [])
+            self.assertEqual(client.get_recordings_for_date('2025-01-15'), [])
+            self.assertEqual(session.paths.count('/v2/accounts/me/recordings'), 1)
+
+            now[0] += ZoomClient.EMPTY_RECORDINGS_CACHE_TTL_SEC
+            self.assertEqual(client.get_recordings_for_date('2025-01-15'), _recordings('2025-01-15'))
+
+            now[0] += ZoomClient.RECORDINGS_CACHE_TTL_SEC - 1
+            self.assertEqual(client.get_recordings_for_date('2025-01-15'), _recordings('2025-01-15'))
+            self.assertEqual(session.paths.count('/v2/accounts/me/recordings'), 2)
+
+    def test_no_match_not_cached(self):
+        """A miss is worked out again on the next call rather than served from the meeting cache"""
+        client = self._client()
+        query = ('nobody@example.org', '2025-01-15T10:00:00Z')
+        self.assertEqual(client.find_meeting(*query), (None, 'no_recording'))
+        self.assertEqual(client.batch_find_meetings([query]), [(None, 'no_recording')])
+        self.assertEqual(len(client._meeting_cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,11 +16,25 @@ Usage:
     meetings = client.get_recordings_for_date('2025-01-15')
 """
 
+import time
+import threading
 import boto3
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Tuple
 from collections import defaultdict
+from concurrent.futures import Future
+
+from summariser.utils.ttl_cache import TTLCache
+
+# Optional Aho-Corasick automaton for batch topic matching (falls back to per-client substring checks)
+try:
+    import ahocorasick
+    AHOCORASICK_ENABLED = bool(ahocorasick.unicode)
+except ImportError:
+    AHOCORASICK_ENABLED = False
 
 
 class ZoomClient:
@@ -28,69 +42,140 @@ class ZoomClient:
 
     DEFAULT_REGION = 'eu-west-2'
     SSM_PREFIX = '/zoom/s2s'
+    TOKEN_REFRESH_MARGIN_SEC = 60  # Refresh this long before the token actually expires
+    COACH_EMAILS_TTL_SEC = 3600  # Zoom users change rarely; reload the name->email mapping hourly
+    # Bounds for the per-date recordings and per-query meeting caches kept across warm invocations
+    RECORDINGS_CACHE_MAX = 64
+    RECORDINGS_CACHE_TTL_SEC = 1800
+    # A day with no recordings yet may only have them still processing, so recheck it soon
+    EMPTY_RECORDINGS_CACHE_TTL_SEC = 10
+    MEETING_CACHE_MAX = 2048
+    MEETING_CACHE_TTL_SEC = 3600
 
     def __init__(self, region: str = None):
         """Initialize Zoom client with SSM credentials."""
         self.region = region or self.DEFAULT_REGION
         ssm = boto3.client('ssm', region_name=self.region)
 
-        self.account_id = self._get_ssm_param(ssm, f'{self.SSM_PREFIX}/account_id')
-        self.client_id = self._get_ssm_param(ssm, f'{self.SSM_PREFIX}/client_id')
-        self.client_secret = self._get_ssm_param(ssm, f'{self.SSM_PREFIX}/client_secret')
+        credentials = self._get_ssm_params(ssm, ['account_id', 'client_id', 'client_secret'])
+        self.account_id = credentials['account_id']
+        self.client_id = credentials['client_id']
+        self.client_secret = credentials['client_secret']
 
         self.access_token = None
+        self.token_expiry = 0.0  # time.monotonic() deadline for access_token
         self.base_url = 'https://api.zoom.us/v2'
 
+        # One pooled session for zoom.us and api.zoom.us so connections are reused between calls.
+        # Transient statuses are retried; the last response is still returned for the callers' checks.
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=10,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False
+            )
+        ))
+
         # Caches
-        self._recordings_cache: Dict[str, List[Dict]] = {}
+        # date -> {'recordings', 'meetings', 'by_host'}: the raw listing plus lookups built in _index_recordings
+        self._recordings_cache = TTLCache(self.RECORDINGS_CACHE_MAX, self.RECORDINGS_CACHE_TTL_SEC)
         self._coach_emails: Dict[str, str] = {}
-        self._meeting_cache: Dict[str, Any] = {}
-
-    def _get_ssm_param(self, ssm, name: str) -> str:
-        """Get parameter from SSM Parameter Store."""
-        response = ssm.get_parameter(Name=name, WithDecryption=True)
-        return response['Parameter']['Value'].strip()
+        self._coach_emails_expiry = 0.0  # time.monotonic() deadline for _coach_emails
+        self._meeting_cache = TTLCache(self.MEETING_CACHE_MAX, self.MEETING_CACHE_TTL_SEC)
+
+        # Zoom calls currently running, so concurrent callers wanting the same data share one request
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    def _get_ssm_params(self, ssm, keys: List[str]) -> Dict[str, str]:
+        """Get parameters under SSM_PREFIX from SSM Parameter Store in one call, keyed by their short name."""
+        names = [f'{self.SSM_PREFIX}/{key}' for key in keys]
+        response = ssm.get_parameters(Names=names, WithDecryption=True)
+        if response.get('InvalidParameters'):
+            raise RuntimeError(f"Missing SSM parameters: {', '.join(response['InvalidParameters'])}")
+        values = {p['Name']: p['Value'].strip() for p in response['Parameters']}
+        return {key: values[name] for key, name in zip(keys, names)}
 
     def authenticate(self) -> bool:
         """Get OAuth access token using Server-to-Server credentials."""
-        response = requests.post(
+        response = self._session.post(
             'https://zoom.us/oauth/token',
             params={'grant_type': 'account_credentials', 'account_id': self.account_id},
             auth=(self.client_id, self.client_secret)
         )
         if response.status_code == 200:
-            self.access_token = response.json()['access_token']
+            token = response.json()
+            self.access_token = token['access_token']
+            self.token_expiry = time.monotonic() + token.get('expires_in', 3600) - self.TOKEN_REFRESH_MARGIN_SEC
+            self._session.headers['Authorization'] = f'Bearer {self.access_token}'
             return True
         return False
 
+    def _token_expired(self) -> bool:
+        """True when there is no access token or it is within the refresh margin of expiry."""
+        return not self.access_token or time.monotonic() >= self.token_expiry
+
     def _ensure_authenticated(self):
         """Ensure we have a valid access token."""
-        if not self.access_token:
+        if self._token_expired():
             if not self.authenticate():
                 raise RuntimeError("Failed to authenticate with Zoom API")
 
-    def _headers(self) -> Dict[str, str]:
-        """Get authorization headers."""
-        return {'Authorization': f'Bearer {self.access_token}'}
+    def _single_flight(self, key: str, fetch):
+        """
+        Return fetch(), or if another thread is already running the fetch for key,
+        wait for and return its result instead of making the same request again.
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+        future.set_result(result)
+        return result
 
     def load_coach_emails(self) -> Dict[str, str]:
         """
         Load all Zoom users and create name->email mapping.
         Returns dict mapping lowercase names to email addresses.
+        The mapping is reloaded once it is older than COACH_EMAILS_TTL_SEC.
         """
         self._ensure_authenticated()
 
-        if self._coach_emails:
+        if self._coach_emails and time.monotonic() < self._coach_emails_expiry:
             return self._coach_emails
+        return self._single_flight('users', self._fetch_coach_emails)
 
-        response = requests.get(
-            f'{self.base_url}/users',
-            headers=self._headers(),
-            params={'status': 'active', 'page_size': 300}
-        )
+    def _fetch_coach_emails(self) -> Dict[str, str]:
+        """List Zoom users into _coach_emails (unless another call just did)."""
+        if self._coach_emails and time.monotonic() < self._coach_emails_expiry:
+            return self._coach_emails
 
-        if response.status_code == 200:
-            for user in response.json().get('users', []):
+        coach_emails: Dict[str, str] = {}
+        params = {'status': 'active', 'page_size': 300}
+        complete = False
+        while True:
+            response = self._session.get(f'{self.base_url}/users', params=params)
+            if response.status_code != 200:
+                break
+
+            data = response.json()
+            for user in data.get('users', []):
                 first = user.get('first_name', '')
                 last = user.get('last_name', '')
                 display = user.get('display_name', '')
@@ -99,17 +184,29 @@ class ZoomClient:
                 # Map multiple name formats to email
                 full_name = f"{first} {last}".strip().lower()
                 if full_name:
-                    self._coach_emails[full_name] = email
+                    coach_emails[full_name] = email
                 if display:
-                    self._coach_emails[display.lower()] = email
+                    coach_emails[display.lower()] = email
+
+            # Accounts with more users than page_size come back in several pages
+            next_page_token = data.get('next_page_token')
+            if not next_page_token:
+                complete = True
+                break
+            params = {**params, 'next_page_token': next_page_token}
+
+        if complete:
+            self._coach_emails = coach_emails
+            self._coach_emails_expiry = time.monotonic() + self.COACH_EMAILS_TTL_SEC
+        elif coach_emails and not self._coach_emails:
+            # Partial listing: use it for now, but try again on the next call
+            self._coach_emails = coach_emails
 
         return self._coach_emails
 
     def get_coach_email(self, coach_name: str) -> Optional[str]:
         """Get coach email by name (case-insensitive)."""
-        if not self._coach_emails:
-            self.load_coach_emails()
-        return self._coach_emails.get(coach_name.lower())
+        return self.load_coach_emails().get(coach_name.lower())
 
     def get_recordings_for_date(self, date_str: str) -> List[Dict]:
         """
@@ -117,26 +214,61 @@ class ZoomClient:
         date_str should be in YYYY-MM-DD format.
         Results are cached.
         """
+        return self._recordings_entry(date_str)['recordings']
+
+    def _recordings_entry(self, date_str: str) -> Dict:
+        """Cached recordings and lookup index for a date, fetching them if absent or expired."""
         self._ensure_authenticated()
 
-        if date_str in self._recordings_cache:
-            return self._recordings_cache[date_str]
+        entry = self._recordings_cache.get(date_str)
+        if entry is not None:
+            return entry
+        return self._single_flight(f'recordings:{date_str}', lambda: self._fetch_recordings(date_str))
+
+    def _fetch_recordings(self, date_str: str) -> Dict:
+        """
+        Fetch and cache a date's recordings (unless another call just did), returning the cache entry.
+        A failed request gives an empty entry that isn't cached, so the next call asks Zoom again.
+        """
+        entry = self._recordings_cache.get(date_str)
+        if entry is not None:
+            return entry
 
         try:
-            response = requests.get(
+            response = self._session.get(
                 f'{self.base_url}/accounts/me/recordings',
-                headers=self._headers(),
                 params={'from': date_str, 'to': date_str, 'page_size': 300}
             )
             if response.status_code == 200:
-                recordings = response.json().get('meetings', [])
-                self._recordings_cache[date_str] = recordings
-                return recordings
+                entry = self._index_recordings(response.json().get('meetings', []))
+                ttl = self.RECORDINGS_CACHE_TTL_SEC if entry['recordings'] else self.EMPTY_RECORDINGS_CACHE_TTL_SEC
+                self._recordings_cache.set(date_str, entry, ttl=ttl)
+                return entry
+            print(f"Error fetching recordings for {date_str}: HTTP {response.status_code}")
         except Exception as e:
             print(f"Error fetching recordings for {date_str}: {e}")
 
-        self._recordings_cache[date_str] = []
-        return []
+        return self._index_recordings([])
+
+    @staticmethod
+    def _index_recordings(recordings: List[Dict]) -> Dict:
+        """
+        A date's recordings along with a lookup index, as held in _recordings_cache.
+        Each meeting is held as (meeting, start_dt, topic_lower), with start_dt None if start_time
+        doesn't parse; entries are listed in recording order and grouped by lowercased host email.
+        """
+        entries = []
+        by_host = defaultdict(list)
+        for meeting in recordings:
+            try:
+                start_dt = datetime.fromisoformat(meeting['start_time'].replace('Z', '+00:00'))
+            except (ValueError, KeyError, AttributeError):
+                start_dt = None
+            entry = (meeting, start_dt, meeting.get('topic', '').lower())
+            entries.append(entry)
+            by_host[meeting.get('host_email', '').lower()].append(entry)
+
+        return {'recordings': recordings, 'meetings': entries, 'by_host': dict(by_host)}
 
     def get_recordings_for_range(self, from_date: str, to_date: str) -> List[Dict]:
         """Get all recordings for a date range."""
@@ -144,9 +276,8 @@ class ZoomClient:
 
         all_recordings = []
         try:
-            response = requests.get(
+            response = self._session.get(
                 f'{self.base_url}/accounts/me/recordings',
-                headers=self._headers(),
                 params={'from': from_date, 'to': to_date, 'page_size': 300}
             )
             if response.status_code == 200:
@@ -184,80 +315,213 @@ class ZoomClient:
         self._ensure_authenticated()
         self.load_coach_emails()
 
-        # Parse datetime
-        try:
-            dt = datetime.fromisoformat(call_datetime.replace('Z', '+00:00'))
-        except (ValueError, AttributeError):
+        query = self._parse_meeting_query(client_identifier, call_datetime, coach_name)
+        if query is None:
             return None, 'invalid_date'
 
         # Check cache
-        cache_key = f"{client_identifier}_{dt.strftime('%Y-%m-%d')}_{coach_name or ''}"
-        if cache_key in self._meeting_cache:
-            return self._meeting_cache[cache_key]
+        cache_key = query['cache_key']
+        cached = self._meeting_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         # Get coach email
         coach_email = None
         if coach_name:
             coach_email = self.get_coach_email(coach_name)
 
-        # Extract searchable client name from email
-        name_parts = client_identifier.split('@')[0].replace('.', ' ').replace('_', ' ')
-
         # Get recordings for the date
-        date_str = dt.strftime('%Y-%m-%d')
-        recordings = self.get_recordings_for_date(date_str)
+        query['recordings'] = self._recordings_entry(query['date_str'])
 
         time_window_sec = time_window_hours * 3600
 
         # Strategy 1: Match by coach (host) + time window
+        result = None
         if coach_email:
-            for meeting in recordings:
-                host_email = meeting.get('host_email', '').lower()
-                if host_email != coach_email:
-                    continue
-
-                try:
-                    meeting_dt = datetime.fromisoformat(meeting['start_time'].replace('Z', '+00:00'))
-                    time_diff = abs((meeting_dt - dt).total_seconds())
-                    if time_diff <= time_window_sec:
-                        meeting_id = str(meeting.get('id'))
-                        topic = meeting.get('topic', '').lower()
-
-                        # Check if client name also in topic (stronger match)
-                        if name_parts.lower() in topic or client_identifier.lower() in topic:
-                            result = (meeting_id, 'adviser+client')
-                        else:
-                            result = (meeting_id, 'adviser+time')
-
-                        self._meeting_cache[cache_key] = result
-                        return result
-                except (ValueError, KeyError):
-                    pass
+            result = self._match_by_host(query, coach_email, time_window_sec)
 
         # Strategy 2: Match by client name in topic
-        for meeting in recordings:
-            topic = meeting.get('topic', '').lower()
-            if client_identifier.lower() in topic or name_parts.lower() in topic:
-                try:
-                    meeting_dt = datetime.fromisoformat(meeting['start_time'].replace('Z', '+00:00'))
-                    time_diff = abs((meeting_dt - dt).total_seconds())
-                    if time_diff <= time_window_sec:
-                        meeting_id = str(meeting.get('id'))
-                        result = (meeting_id, 'client_topic')
-                        self._meeting_cache[cache_key] = result
-                        return result
-                except (ValueError, KeyError):
-                    pass
+        if result is None:
+            result = self._match_by_topic(query, time_window_sec)
 
         # No match found
-        if coach_name and not coach_email:
-            result = (None, 'adviser_not_found')
-        else:
-            result = (None, 'no_recording')
+        if result is None:
+            result = self._no_match(coach_name, coach_email)
 
-        self._meeting_cache[cache_key] = result
+        self._cache_meeting_result(cache_key, result)
         return result
 
+    def batch_find_meetings(self, queries: List[Tuple], time_window_hours: float = 2.0) -> List[tuple]:
+        """
+        find_meeting for many queries at once.
+
+        Args:
+            queries: (client_identifier, call_datetime) or (client_identifier, call_datetime, coach_name) tuples
+            time_window_hours: How close the meeting time should be (default 2 hours)
+
+        Returns:
+            list: find_meeting's (meeting_id, match_type) result for each query, in order.
+            With pyahocorasick installed, the topic search for each date is a single pass over
+            that date's topics for all of its clients.
+        """
+        self._ensure_authenticated()
+        self.load_coach_emails()
+
+        time_window_sec = time_window_hours * 3600
+        results: List[Optional[tuple]] = [None] * len(queries)
+        pending: Dict[tuple, Dict] = {}  # query_key -> query; repeats of a query share its result
+        pending_positions = []  # (position, cache_key, query_key)
+
+        for position, (client_identifier, call_datetime, *rest) in enumerate(queries):
+            coach_name = rest[0] if rest else None
+            query = self._parse_meeting_query(client_identifier, call_datetime, coach_name)
+            if query is None:
+                results[position] = (None, 'invalid_date')
+                continue
+            cached = self._meeting_cache.get(query['cache_key'])
+            if cached is not None:
+                results[position] = cached
+                continue
+            query_key = query['query_key']
+            pending_positions.append((position, query['cache_key'], query_key))
+            if query_key not in pending:
+                query['coach_email'] = self.get_coach_email(coach_name) if coach_name else None
+                pending[query_key] = query
+
+        # Strategy 1 (host index lookup) per query; whatever it doesn't match is searched by topic per date
+        resolved: Dict[tuple, tuple] = {}
+        topic_queries: Dict[str, List[Dict]] = defaultdict(list)
+        for query_key, query in pending.items():
+            query['recordings'] = self._recordings_entry(query['date_str'])
+            result = None
+            if query['coach_email']:
+                result = self._match_by_host(query, query['coach_email'], time_window_sec)
+            if result is None:
+                topic_queries[query['date_str']].append(query)
+            else:
+                resolved[query_key] = result
+
+        # Strategy 2 per date
+        for date_queries in topic_queries.values():
+            matches = self._match_by_topic_batch(date_queries, time_window_sec)
+            for query in date_queries:
+                query_key = query['query_key']
+                resolved[query_key] = matches.get(query_key) or self._no_match(query['coach_name'], query['coach_email'])
+
+        # As with find_meeting one query at a time: once a cache key has found a meeting, later
+        # queries with that key get the same answer, while a miss (not cached) only answers itself
+        found: Dict[str, tuple] = {}
+        for position, cache_key, query_key in pending_positions:
+            result = found.get(cache_key) or resolved[query_key]
+            if result[0] is not None:
+                found.setdefault(cache_key, result)
+            results[position] = result
+        for cache_key, result in found.items():
+            self._cache_meeting_result(cache_key, result)
+        return results
+
+    @staticmethod
+    def _parse_meeting_query(client_identifier: str, call_datetime: str, coach_name: Optional[str]) -> Optional[Dict]:
+        """Normalise a find_meeting query, or None if call_datetime can't be parsed."""
+        # Parse datetime
+        try:
+            dt = datetime.fromisoformat(call_datetime.replace('Z', '+00:00'))
+        except (ValueError, AttributeError):
+            return None
+
+        # Extract searchable client name from email
+        name_parts = client_identifier.split('@')[0].replace('.', ' ').replace('_', ' ')
+        date_str = dt.strftime('%Y-%m-%d')
+        return {
+            'dt': dt,
+            'date_str': date_str,
+            'cache_key': f"{client_identifier}_{date_str}_{coach_name or ''}",
+            'query_key': (client_identifier, dt, coach_name),  # identical queries always match alike
+            'coach_name': coach_name,
+            'client_lower': client_identifier.lower(),
+            'name_lower': name_parts.lower()
+        }
+
+    def _match_by_host(self, query: Dict, coach_email: str, time_window_sec: float) -> Optional[tuple]:
+        """First of the coach's meetings on the query date within the time window, if any."""
+        for meeting, meeting_dt, topic in query['recordings']['by_host'].get(coach_email, ()):
+            if meeting_dt is None:
+                continue
+            time_diff = abs((meeting_dt - query['dt']).total_seconds())
+            if time_diff <= time_window_sec:
+                meeting_id = str(meeting.get('id'))
+
+                # Check if client name also in topic (stronger match)
+                if query['name_lower'] in topic or query['client_lower'] in topic:
+                    return meeting_id, 'adviser+client'
+                return meeting_id, 'adviser+time'
+        return None
+
+    def _match_by_topic(self, query: Dict, time_window_sec: float) -> Optional[tuple]:
+        """First meeting on the query date naming the client in its topic within the time window, if any."""
+        client_lower = query['client_lower']
+        name_lower = query['name_lower']
+        for meeting, meeting_dt, topic in query['recordings']['meetings']:
+            if meeting_dt is None:
+                continue
+            if client_lower in topic or name_lower in topic:
+                time_diff = abs((meeting_dt - query['dt']).total_seconds())
+                if time_diff <= time_window_sec:
+                    return str(meeting.get('id')), 'client_topic'
+        return None
+
+    def _match_by_topic_batch(self, queries: List[Dict], time_window_sec: float) -> Dict[tuple, tuple]:
+        """_match_by_topic for several queries on the same date, keyed by query_key (matches only)."""
+        matches = {}
+        needles = defaultdict(list)
+        for query in queries:
+            if not AHOCORASICK_ENABLED or len(queries) == 1 or not query['client_lower'] or not query['name_lower']:
+                # An empty needle is in every topic, which the automaton can't express
+                result = self._match_by_topic(query, time_window_sec)
+                if result is not None:
+                    matches[query['query_key']] = result
+                continue
+            needles[query['client_lower']].append(query)
+            needles[query['name_lower']].append(query)
+
+        if not needles:
+            return matches
+
+        automaton = ahocorasick.Automaton()
+        for needle, needle_queries in needles.items():
+            automaton.add_word(needle, needle_queries)
+        automaton.make_automaton()
+
+        # Walk topics in recording order so each query keeps its first qualifying meeting
+        unresolved = {query['query_key'] for needle_queries in needles.values() for query in needle_queries}
+        for meeting, meeting_dt, topic in queries[0]['recordings']['meetings']:
+            if meeting_dt is None:
+                continue
+            for _, needle_queries in automaton.iter(topic):
+                for query in needle_queries:
+                    query_key = query['query_key']
+                    if query_key in unresolved and abs((meeting_dt - query['dt']).total_seconds()) <= time_window_sec:
+                        matches[query_key] = (str(meeting.get('id')), 'client_topic')
+                        unresolved.discard(query_key)
+            if not unresolved:
+                break
+        return matches
+
+    def _cache_meeting_result(self, cache_key: str, result: tuple) -> None:
+        """
+        Cache a found meeting. Misses aren't cached: the client is shared across warm invocations,
+        and a recording that is still processing should be found once Zoom lists it.
+        """
+        if result[0] is not None:
+            self._meeting_cache[cache_key] = result
+
+    @staticmethod
+    def _no_match(coach_name: Optional[str], coach_email: Optional[str]) -> tuple:
+        """Result when neither strategy finds a meeting."""
+        if coach_name and not coach_email:
+            return None, 'adviser_not_found'
+        return None, 'no_recording'
+
     def search_by_email(
         self,
         email: str,
@@ -305,9 +569,17 @@ class ZoomClient:
         # Don't clear coach_emails as that rarely changes
 
 
+# Clients per region, reused across warm Lambda invocations (credentials, token and caches)
+_shared_clients: Dict[str, ZoomClient] = {}
+
+
 # Convenience function for simple usage
 def create_zoom_client(region: str = None) -> ZoomClient:
-    """Create and authenticate a ZoomClient."""
-    client = ZoomClient(region=region)
-    client.authenticate()
+    """Get an authenticated ZoomClient, reusing the shared instance for the region."""
+    region = region or ZoomClient.DEFAULT_REGION
+    client = _shared_clients.get(region)
+    if client is None:
+        client = _shared_clients[region] = ZoomClient(region=region)
+    if client._token_expired():
+        client.authenticate()
     return client